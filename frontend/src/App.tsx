@@ -96,7 +96,8 @@ type FileRecord = {
 }
 
 type DownloadEvent = {
-  timestamp: string
+  // Nanoseconds since the Unix epoch
+  timestamp: number | string
   filename: string
   status: string
   description: string
@@ -686,7 +687,7 @@ function ActionButtons({
           onClick={forceScrape}
           isDisabled={state.scraping_status === 'running'}
         >
-          Force Scrape (rebuild links.json)
+          Force Scrape (rebuild links.jsonl)
         </Button>
       </WrapItem>
       <WrapItem>
@@ -873,8 +874,14 @@ function SelectedFilesCard({
   )
 }
 
-function formatDownloadTimestamp(timestamp: string | undefined): string {
-  if (!timestamp) return 'Unknown time'
+function formatDownloadTimestamp(timestamp: number | string | undefined): string {
+  if (timestamp === undefined || timestamp === '') return 'Unknown time'
+  if (typeof timestamp === 'number') {
+    return new Date(timestamp / 1e6).toLocaleString(undefined, {
+      dateStyle: 'short',
+      timeStyle: 'medium',
+    })
+  }
   const parsed = Date.parse(timestamp)
   if (!Number.isNaN(parsed)) {
     return new Date(parsed).toLocaleString(undefined, {
@@ -0,0 +1,92 @@
+"""Run the Scrapy crawl in a child process on behalf of the API server.
+
+Scrapy's Twisted reactor cannot be restarted inside one process, and a crawl
+keeps the GIL busy for minutes; running it in a spawned worker keeps the API
+responsive and lets every scrape start from a fresh reactor. Log records from
+the tracked loggers are forwarded to the parent over a queue so they still
+reach the UI log, and scrape progress reported by ``ScrapeProgressExtension``
+travels over a second queue to be replayed into the API's state. This module
+is imported by the child, so it deliberately avoids importing the FastAPI app.
+"""
+from __future__ import annotations
+
+import logging
+import logging.handlers
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Set in the child by _init_worker when the parent wants progress updates
+_progress_queue: Any = None
+
+
+def _init_worker(log_queue: Any, logger_names: Iterable[str], level: int, progress_queue: Any = None) -> None:
+    global _progress_queue
+    # Runs before _scrape imports main and the tools: setup_logger leaves loggers that
+    # already have a handler alone, so the tracked loggers end up with the queue as their
+    # only handler and the parent stays the sole writer of its rotating log files.
+    handler = logging.handlers.QueueHandler(log_queue)
+    for name in logger_names:
+        target = logging.getLogger(name)
+        target.setLevel(level)
+        target.handlers = [handler]
+    _progress_queue = progress_queue
+
+
+def _queue_progress(progress: float, snapshot: Dict[str, int], message: Optional[str] = None) -> None:
+    """``SCRAPE_PROGRESS_CALLBACK`` used in the child: hand the update to the parent."""
+    _progress_queue.put((progress, message))
+
+
+def drain_progress(progress_queue: Any, callback: Callable[[float, Optional[str]], None]) -> None:
+    """Apply ``(progress, message)`` updates from *progress_queue* until a ``None`` sentinel arrives."""
+    for update in iter(progress_queue.get, None):
+        callback(*update)
+
+
+def _scrape(options: Dict[str, Any]) -> bool:
+    from main import scrape_data_with_config
+
+    if _progress_queue is not None:
+        options = dict(options, progress_callback=_queue_progress)
+    return scrape_data_with_config(**options)
+
+
+def scrape_in_subprocess(
+    log_handler: logging.Handler,
+    logger_names: Iterable[str],
+    progress_callback: Optional[Callable[[float, Optional[str]], None]] = None,
+    **options: Any,
+) -> bool:
+    """Run ``scrape_data_with_config(**options)`` in a fresh process and return its result.
+
+    Records logged by *logger_names* in the child are replayed into *log_handler*, and
+    crawl progress is passed to *progress_callback* as ``(progress, message)`` from a
+    drain thread in this process.
+    """
+    context = multiprocessing.get_context("spawn")
+    log_queue = context.Queue()
+    progress_queue = context.Queue() if progress_callback is not None else None
+    level = logging.DEBUG if options.get("verbose") else logging.INFO
+    listener = logging.handlers.QueueListener(log_queue, log_handler, respect_handler_level=True)
+    listener.start()
+    drainer = None
+    if progress_queue is not None:
+        drainer = threading.Thread(
+            target=drain_progress, args=(progress_queue, progress_callback), name="scrape-progress", daemon=True
+        )
+        drainer.start()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(log_queue, [name for name in logger_names if name], level, progress_queue),
+        ) as pool:
+            return pool.submit(_scrape, options).result()
+    finally:
+        listener.stop()
+        if drainer is not None:
+            progress_queue.put(None)
+            drainer.join()
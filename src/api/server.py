@@ -6,29 +6,45 @@ orchestrate jobs and monitor progress.
 """
 from __future__ import annotations
 
+import asyncio
+import heapq
 import logging
 import os
+import operator
 import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Literal, Tuple
+from typing import Any, Callable, Dict, List, Optional, Literal, Tuple
 
-from fastapi import BackgroundTasks, Body, FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import Body, FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel, Field
 
+try:  # optional fast JSON codec for API responses
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
 from main import (
     download_data_with_config,
     filter_latest_versions,
-    scrape_data_with_config,
 )
-from .state_manager import state_manager
+from tools.manifest import read_records
+from .scrape_worker import scrape_in_subprocess
+from .state_manager import SORT_FIELDS, FileRow, state_manager
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="3GPP Downloader API", version="1.0.0")
+app = FastAPI(
+    title="3GPP Downloader API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 FRONTEND_DIST = Path(os.getenv("FRONTEND_DIST", ROOT_DIR / "frontend" / "dist")).resolve()
@@ -40,8 +56,18 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=[origin.strip() for origin in allowed_origins.split(",") if origin.strip()],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # The SPA only uses these methods and JSON bodies; explicit lists avoid header
+    # reflection on preflight, and max_age lets browsers cache the preflight result.
+    allow_methods=["GET", "POST", "PATCH", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,
+)
+# /api/state and /api/files payloads are repetitive JSON (log lines, catalogue rows) and
+# shrink several-fold; level 5 keeps most of the ratio for a fraction of level 9's CPU.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=int(os.getenv("API_GZIP_MIN_SIZE", "1024")),
+    compresslevel=int(os.getenv("API_GZIP_LEVEL", "5")),
 )
 
 # ---------------------------------------------------------------------
@@ -93,20 +119,34 @@ class FilesQuery(BaseModel):
 # ---------------------------------------------------------------------
 
 
+class _UILogFormatter(logging.Formatter):
+    """One-line formatter for the UI log: exceptions are summarised, not rendered.
+
+    Full tracebacks still reach the file/console handlers; this formatter never sets
+    ``record.exc_text``, so it does not leak its summary into their output.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = record.getMessage()
+        text = self.formatMessage(record)
+        if record.exc_info and record.exc_info[0] is not None:
+            text = f"{text} ({record.exc_info[0].__name__}: {record.exc_info[1]})"
+        return text
+
+
 class UILogHandler(logging.Handler):
     """Redirect log output into the shared state manager."""
 
     def __init__(self, level: int = logging.INFO) -> None:
         super().__init__(level=level)
-        self.setFormatter(logging.Formatter("[%(name)s][%(levelname)s] %(message)s"))
+        self.setFormatter(_UILogFormatter("[%(name)s][%(levelname)s] %(message)s"))
 
     def emit(self, record: logging.LogRecord) -> None:
         try:
             message = self.format(record)
         except Exception:  # pragma: no cover - defensive
             message = record.getMessage()
-        for line in message.splitlines():
-            state_manager.add_log(line)
+        state_manager.add_logs(message.splitlines() if "\n" in message else [message])
 
 
 ui_log_handler = UILogHandler()
@@ -121,12 +161,18 @@ def configure_logging_bridge(verbose: bool) -> None:
     level = logging.DEBUG if verbose else logging.INFO
     ui_log_handler.setLevel(level)
 
-    for name in _TRACKED_LOGGERS:
-        if not name:
-            continue
+    names = {name for name in _TRACKED_LOGGERS if name}
+    for name in names:
         target = logging.getLogger(name)
         target.setLevel(level)
-        if ui_log_handler not in target.handlers:
+        target.disabled = False
+        # A record propagates through every ancestor, so the handler only goes on the
+        # top-most tracked logger of each family to avoid emitting it twice.
+        if any(name.startswith(f"{other}.") for other in names):
+            target.propagate = True
+            if ui_log_handler in target.handlers:
+                target.removeHandler(ui_log_handler)
+        elif ui_log_handler not in target.handlers:
             target.addHandler(ui_log_handler)
 
     # Ensure this module follows the same verbosity
@@ -143,46 +189,75 @@ def _ensure_directories() -> None:
     Path("logs").mkdir(parents=True, exist_ok=True)
 
 
-def _coerce_release(value: Any) -> Optional[int]:
-    if value is None:
-        return None
-    if isinstance(value, int):
-        return value
-    if isinstance(value, float):
-        return int(value)
-    if isinstance(value, str):
+# Parsed manifests keyed by path, reused while the file's (mtime_ns, size) is unchanged
+# so reloads and post-job refreshes skip re-reading and re-parsing large catalogues.
+_MANIFEST_CACHE: Dict[Path, Tuple[int, int, List[Dict[str, Any]]]] = {}
+_MANIFEST_CACHE_LOCK = threading.Lock()
+
+
+_LATEST_CANDIDATES = (Path("downloads/latest.json"), Path("latest.json"))
+_LINKS_CANDIDATES = (Path("downloads/links.jsonl"), Path("downloads/links.json"), Path("links.json"))
+
+
+def _scan_manifests() -> Dict[Path, os.stat_result]:
+    """Find which manifest candidates exist with one directory read per folder."""
+    known = set(_LATEST_CANDIDATES + _LINKS_CANDIDATES)
+    found: Dict[Path, os.stat_result] = {}
+    for folder in {candidate.parent for candidate in known}:
         try:
-            return int(value.strip())
-        except ValueError:
-            return None
-    return None
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    path = folder / entry.name
+                    if path in known and entry.is_file():
+                        found[path] = entry.stat()
+        except OSError:
+            continue
+    return found
+
+
+def _read_manifest(path: Path, file_stat: os.stat_result) -> List[Dict[str, Any]]:
+    with _MANIFEST_CACHE_LOCK:
+        cached = _MANIFEST_CACHE.get(path)
+    if cached and cached[0] == file_stat.st_mtime_ns and cached[1] == file_stat.st_size:
+        return cached[2]
+    payload: List[Dict[str, Any]] = read_records(path)
+    with _MANIFEST_CACHE_LOCK:
+        _MANIFEST_CACHE[path] = (file_stat.st_mtime_ns, file_stat.st_size, payload)
+    return payload
+
+
+def _forget_manifest(path: Path) -> None:
+    with _MANIFEST_CACHE_LOCK:
+        _MANIFEST_CACHE.pop(path, None)
 
 
 def _load_available_files(prefer: Optional[str] = None) -> None:
-    def load_from_candidates(candidates: List[Path], file_type: str) -> bool:
+    present = _scan_manifests()
+
+    def load_from_candidates(candidates: Tuple[Path, ...], file_type: str) -> bool:
         for candidate in candidates:
-            if candidate.exists():
-                try:
-                    files = candidate.read_text()
-                    payload: List[Dict[str, Any]] = []
-                    if files:
-                        payload = json.loads(files)
-                    state_manager.set_available_files(payload, file_type)
-                    return True
-                except Exception as exc:  # pragma: no cover - defensive
-                    state_manager.add_log(f"Error reading {candidate}: {exc}")
+            file_stat = present.get(candidate)
+            if file_stat is None:
+                continue
+            try:
+                payload = _read_manifest(candidate, file_stat)
+            except Exception as exc:  # pragma: no cover - defensive
+                state_manager.add_log(f"Error reading {candidate}: {exc}")
+                continue
+            if payload is state_manager.available_files and state_manager.current_file_type == file_type:
+                # Same mtime/size as the loaded manifest: keep the current catalogue
+                return True
+            state_manager.set_available_files(payload, file_type)
+            return True
         return False
 
-    latest_candidates = [Path("downloads/latest.json"), Path("latest.json")]
-    links_candidates = [Path("downloads/links.json"), Path("links.json")]
-
-    priority: List[Tuple[str, List[Path]]] = []
+    priority: List[Tuple[str, Tuple[Path, ...]]] = []
     if prefer == "all":
-        priority.extend([("all", links_candidates), ("filtered", latest_candidates)])
+        priority.extend([("all", _LINKS_CANDIDATES), ("filtered", _LATEST_CANDIDATES)])
     elif prefer == "filtered":
-        priority.extend([("filtered", latest_candidates), ("all", links_candidates)])
+        priority.extend([("filtered", _LATEST_CANDIDATES), ("all", _LINKS_CANDIDATES)])
     else:
-        priority.extend([("filtered", latest_candidates), ("all", links_candidates)])
+        priority.extend([("filtered", _LATEST_CANDIDATES), ("all", _LINKS_CANDIDATES)])
 
     for file_type, candidates in priority:
         if load_from_candidates(candidates, file_type):
@@ -191,31 +266,43 @@ def _load_available_files(prefer: Optional[str] = None) -> None:
     state_manager.clear_files()
 
 
-# JSON is needed in helper
-import json  # noqa: E402 - imported after helper definition so lint stays happy
+_download_cancel_event = threading.Event()
+
+# Long-running jobs get their own executors instead of Starlette's shared
+# threadpool, so a scrape or download never starves the sync endpoint handlers.
+_io_job_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="io-job")
+_cpu_job_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="filter-job")
 
 
-_scrape_lock = threading.Lock()
-_filter_lock = threading.Lock()
-_download_lock = threading.Lock()
-_download_cancel_event = threading.Event()
+def _submit_job(pool: ThreadPoolExecutor, job: Callable[..., None], *args: Any) -> None:
+    def report_failure(future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Background job %s failed", job.__name__, exc_info=future.exception())
+
+    pool.submit(job, *args).add_done_callback(report_failure)
+
+
+def _apply_scrape_progress(progress: float, message: Optional[str]) -> None:
+    # Updates from the scrape worker only move the bar forward, like the in-process extension did
+    state_manager.set_scraping_status("running", max(progress, state_manager.scraping_progress or 0.0), message)
 
 
 def _run_scrape_job(force: bool = False, resume_override: Optional[bool] = None) -> None:
-    if not _scrape_lock.acquire(blocking=False):
-        return
+    # The "scrape" job slot was claimed by the endpoint; release it however the job ends
     try:
         _ensure_directories()
         state_manager.set_scraping_status("running", 5.0, "Starting scraper...")
         if force:
             cleared = False
-            for candidate in [Path("downloads/links.json"), Path("links.json"), Path("downloads/latest.json")]:
-                if candidate.exists():
-                    try:
-                        candidate.unlink()
-                        cleared = True
-                    except Exception as exc:  # pragma: no cover - defensive
-                        state_manager.add_log(f"Failed to remove {candidate}: {exc}")
+            for candidate in _LINKS_CANDIDATES + (Path("downloads/latest.json"),):
+                _forget_manifest(candidate)
+                try:
+                    candidate.unlink()
+                    cleared = True
+                except FileNotFoundError:
+                    pass
+                except Exception as exc:  # pragma: no cover - defensive
+                    state_manager.add_log(f"Failed to remove {candidate}: {exc}")
             if cleared:
                 state_manager.add_log("Force scrape requested: cleared cached manifests")
         settings = state_manager.get_settings()
@@ -226,15 +313,18 @@ def _run_scrape_job(force: bool = False, resume_override: Optional[bool] = None)
                     f"Resume mode overridden to {'on' if resume_override else 'off'} for this scrape run"
                 )
             resume_mode = resume_override
-        success = scrape_data_with_config(
-                resume=resume_mode,
-                no_download=settings.get("no_download", False),
-                all_versions=settings.get("download_all_versions", False),
-                organize_by_series=settings.get("organize_by_series", False),
-                specific_release=settings.get("specific_release"),
-                threads=settings.get("thread_count", 5),
-                verbose=settings.get("verbose_logging", False),
-            )
+        success = scrape_in_subprocess(
+            ui_log_handler,
+            _TRACKED_LOGGERS,
+            progress_callback=_apply_scrape_progress,
+            resume=resume_mode,
+            no_download=settings.get("no_download", False),
+            all_versions=settings.get("download_all_versions", False),
+            organize_by_series=settings.get("organize_by_series", False),
+            specific_release=settings.get("specific_release"),
+            threads=settings.get("thread_count", 5),
+            verbose=settings.get("verbose_logging", False),
+        )
 
         if success:
             state_manager.set_scraping_status("running", 85.0, "Scrape completed, loading files...")
@@ -250,50 +340,74 @@ def _run_scrape_job(force: bool = False, resume_override: Optional[bool] = None)
     except Exception as exc:  # pragma: no cover - defensive
         state_manager.set_scraping_status("error", state_manager.scraping_progress, f"Scraping error: {exc}")
     finally:
-        _scrape_lock.release()
+        state_manager.end_job("scrape")
 
 
 def _run_filter_job() -> None:
-    if not _filter_lock.acquire(blocking=False):
-        return
+    # The "filter" job slot was claimed by the endpoint; release it however the job ends
     try:
         _ensure_directories()
         state_manager.update_current_operation("Filtering to latest versions...")
 
-        source_path: Optional[Path] = None
-        for candidate in [Path("downloads/links.json"), Path("links.json")]:
-            if candidate.exists():
-                source_path = candidate
-                break
+        present = _scan_manifests()
+        source_path: Optional[Path] = next((candidate for candidate in _LINKS_CANDIDATES if candidate in present), None)
 
         if not source_path:
-            state_manager.add_log("Cannot locate links.json for filtering")
+            state_manager.add_log("Cannot locate links.jsonl for filtering")
             state_manager.set_scraping_status("error", state_manager.scraping_progress, "Filtering failed")
             return
 
         output_path = Path("downloads/latest.json")
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        success = filter_latest_versions(input_file=str(source_path), output_file=str(output_path))
-        if success:
+        latest = filter_latest_versions(input_file=str(source_path), output_file=str(output_path))
+        if latest:
             state_manager.update_current_operation("Latest versions ready")
-            _load_available_files(prefer="filtered")
+            # Use the records just written rather than parsing latest.json back in
+            _forget_manifest(output_path)
+            state_manager.set_available_files(latest, "filtered")
         else:
             state_manager.add_log("Filtering command returned no data")
     except Exception as exc:  # pragma: no cover - defensive
         state_manager.add_log(f"Filtering error: {exc}")
     finally:
-        _filter_lock.release()
+        state_manager.end_job("filter")
 
 
 class DownloadProgressTracker:
+    # Minimum seconds between progress-only updates (per file, and for the overall bar)
+    MIN_INTERVAL = 0.2
+
     def __init__(self, total_items: int) -> None:
         self.total_items = max(1, total_items)
         self.completed = 0
         self.errors = 0
         self.lock = threading.Lock()
+        self._last_emit: Dict[str, float] = {}
+        self._last_percent: Dict[str, int] = {}
+
+    def _due(self, key: str, value: float) -> bool:
+        """Rate-limit progress ticks for *key* and drop repeats of the last whole percent.
+
+        Completion (100%) is never delayed by the interval.
+
+        Called without ``self.lock``: the dict operations are atomic, and a race at
+        worst lets one extra tick through.
+        """
+        percent = int(value)
+        if self._last_percent.get(key) == percent:
+            return False  # nothing visible changed since the last update
+        now = time.monotonic()
+        if value < 100 and now - self._last_emit.get(key, 0.0) < self.MIN_INTERVAL:
+            return False
+        self._last_emit[key] = now
+        self._last_percent[key] = percent
+        return True
 
     def __call__(self, identifier: str, status: str, value: float) -> None:
+        # Drop throttled progress ticks before touching any lock
+        if status in ("file_progress", "overall_progress") and not self._due(identifier, value):
+            return
         with self.lock:
             if identifier != "__overall__":
                 filename = identifier
@@ -301,13 +415,17 @@ class DownloadProgressTracker:
                 filename = None
 
             if status == "starting" and filename:
-                state_manager.update_current_download_item(filename)
                 state_manager.record_download_event(filename, "Queued", "Preparing download")
-                state_manager.set_download_status("running", state_manager.download_progress, f"Starting download: {filename}")
+                state_manager.set_download_item_status(
+                    filename, "running", state_manager.download_progress, f"Starting download: {filename}"
+                )
             elif status == "file_progress" and filename:
-                state_manager.update_current_download_item(filename)
-                state_manager.set_download_status("running", state_manager.download_progress, f"Downloading {filename} ({int(value)}%)")
+                state_manager.set_download_item_status(
+                    filename, "running", state_manager.download_progress, f"Downloading {filename} ({int(value)}%)"
+                )
             elif status == "file_complete" and filename:
+                self._last_emit.pop(filename, None)
+                self._last_percent.pop(filename, None)
                 self.completed += 1
                 state_manager.append_completed(filename)
                 state_manager.record_download_event(filename, "Completed", "Saved to downloads")
@@ -328,10 +446,9 @@ class DownloadProgressTracker:
                 state_manager.set_download_status("running", min(progress, 95.0), message)
             elif status == "all_finished":
                 if self.errors:
-                    state_manager.set_download_status("error", 100.0, f"Completed with {self.errors} error(s)")
+                    state_manager.set_download_item_status(None, "error", 100.0, f"Completed with {self.errors} error(s)")
                 else:
-                    state_manager.set_download_status("completed", 100.0, "All downloads completed successfully")
-                state_manager.update_current_download_item(None)
+                    state_manager.set_download_item_status(None, "completed", 100.0, "All downloads completed successfully")
             elif status == "errors":
                 self.errors = int(value)
                 if self.errors:
@@ -339,8 +456,7 @@ class DownloadProgressTracker:
 
 
 def _run_download_job(urls: List[str]) -> None:
-    if not _download_lock.acquire(blocking=False):
-        return
+    # The "download" job slot was claimed by the endpoint; release it however the job ends
     try:
         _ensure_directories()
         _download_cancel_event.clear()
@@ -351,15 +467,13 @@ def _run_download_job(urls: List[str]) -> None:
             state_manager.set_download_status("idle", state_manager.download_progress, "No matching files to download")
             return
 
-        Path("selected.json").write_text(json.dumps(matched, indent=2))
-
         tracker = DownloadProgressTracker(total_items=len(matched))
         state_manager.reset_download_tracking()
         state_manager.set_download_status("running", 10.0, f"Queued {len(matched)} files for download")
 
         settings = state_manager.get_settings()
         success = download_data_with_config(
-            input_file="selected.json",
+            input_file=matched,
             resume=settings.get("resume_downloads", True),
             no_download=settings.get("no_download", False),
             all_versions=settings.get("download_all_versions", False),
@@ -384,7 +498,7 @@ def _run_download_job(urls: List[str]) -> None:
         state_manager.set_download_status("error", state_manager.download_progress, f"Download error: {exc}")
     finally:
         _download_cancel_event.clear()
-        _download_lock.release()
+        state_manager.end_job("download")
 
 
 # ---------------------------------------------------------------------
@@ -393,70 +507,82 @@ def _run_download_job(urls: List[str]) -> None:
 
 
 @app.on_event("startup")
-def on_startup() -> None:
-    state_manager.load_settings()
+async def on_startup() -> None:
+    await asyncio.to_thread(state_manager.load_settings)
     configure_logging_bridge(state_manager.settings.verbose_logging)
     _ensure_directories()
-    _load_available_files()
+    await asyncio.to_thread(_load_available_files)
     state_manager.add_log("API server initialised")
 
 
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    _download_cancel_event.set()
+    _io_job_pool.shutdown(wait=False, cancel_futures=True)
+    _cpu_job_pool.shutdown(wait=False, cancel_futures=True)
+
+
 @app.get("/api/health")
-def health_check() -> Dict[str, str]:
-    return {"status": "ok", "timestamp": time.time()}
+async def health_check() -> Dict[str, Any]:
+    # Liveness probes only need a cheap monotonic counter, not a wall-clock reading
+    return {"status": "ok", "monotonic_ns": time.monotonic_ns()}
 
 
 @app.get("/api/state")
-def get_state() -> Dict:
-    return state_manager.snapshot()
+async def get_state() -> Response:
+    # Dashboards poll this; unchanged state is served from the cached encoding
+    return Response(content=state_manager.snapshot_bytes(), media_type="application/json")
 
 
 @app.get("/api/settings")
-def get_settings() -> Dict:
+async def get_settings() -> Dict:
     return state_manager.get_settings()
 
 
 @app.patch("/api/settings")
-def update_settings(payload: SettingsUpdate) -> Dict:
-    updated = state_manager.update_settings({k: v for k, v in payload.model_dump(exclude_none=True).items()})
+async def update_settings(payload: SettingsUpdate) -> Dict:
+    # Persisting the settings file is the only blocking part
+    updated = await asyncio.to_thread(state_manager.update_settings, payload.model_dump(exclude_none=True))
     if payload.verbose_logging is not None:
         configure_logging_bridge(payload.verbose_logging)
     return updated
 
 
 @app.post("/api/scrape", status_code=202)
-def start_scrape(background_tasks: BackgroundTasks, payload: Optional[ScrapeRequest] = Body(default=None)) -> Dict[str, Any]:
+async def start_scrape(payload: Optional[ScrapeRequest] = Body(default=None)) -> Dict[str, Any]:
     request = payload or ScrapeRequest()
-    if state_manager.scraping_status == "running":
+    if not state_manager.try_begin_job("scrape"):
         raise HTTPException(status_code=409, detail="Scraping already in progress")
-    background_tasks.add_task(_run_scrape_job, request.force, False)
+    _submit_job(_io_job_pool, _run_scrape_job, request.force, False)
     message = "Force scraping started" if request.force else "Scraping started"
     return {"message": message, "force": request.force, "resume_override": False}
 
 
 @app.post("/api/filter", status_code=202)
-def start_filter(background_tasks: BackgroundTasks, payload: Optional[FilterRequest] = Body(default=None)) -> Dict[str, str]:
+async def start_filter(payload: Optional[FilterRequest] = Body(default=None)) -> Dict[str, str]:
     request = payload or FilterRequest()
     if request.clear:
         state_manager.update_current_operation("Showing all available versions")
-        _load_available_files(prefer="all")
+        await asyncio.to_thread(_load_available_files, prefer="all")
         return {"message": "Filter cleared"}
 
-    background_tasks.add_task(_run_filter_job)
+    if not state_manager.try_begin_job("filter"):
+        raise HTTPException(status_code=409, detail="Filtering already in progress")
+    _submit_job(_cpu_job_pool, _run_filter_job)
     return {"message": "Filtering started"}
 
 
 @app.post("/api/download", status_code=202)
-def start_download(request: DownloadRequest, background_tasks: BackgroundTasks) -> Dict[str, Any]:
+async def start_download(request: DownloadRequest) -> Dict[str, Any]:
     request.ensure_valid()
-    if state_manager.download_status == "running":
+    if not state_manager.try_begin_job("download"):
         raise HTTPException(status_code=409, detail="Download already in progress")
-    background_tasks.add_task(_run_download_job, request.urls)
+    _submit_job(_io_job_pool, _run_download_job, request.urls)
     return {"message": "Download started", "selected": len(request.urls)}
 
 
 @app.post("/api/download/stop", status_code=202)
-def stop_download() -> Dict[str, str]:
+async def stop_download() -> Dict[str, str]:
     if state_manager.download_status != "running":
         raise HTTPException(status_code=409, detail="No active download to stop")
     state_manager.add_log("Download cancellation requested")
@@ -465,93 +591,99 @@ def stop_download() -> Dict[str, str]:
     return {"message": "Cancellation requested"}
 
 
-@app.post("/api/files")
-def list_files(payload: Optional[FilesQuery] = Body(default=None)) -> Dict[str, Any]:
-    query = payload or FilesQuery()
-    snapshot = state_manager.snapshot()
-    items: List[Dict[str, Any]] = snapshot.get("available_files", [])
+def _query_files(query: FilesQuery) -> Dict[str, Any]:
+    catalog = state_manager.file_catalog
 
-    filtered = list(items)
+    # Exact filters come straight from the catalogue's buckets; only they get text-searched
+    series = query.series.strip().lower() if query.series else ""
+    rows: List[FileRow] = catalog.select(series=series or None, release=query.release)
 
     if query.query:
-        needle = query.query.strip().lower()
-        if needle:
-            search_fields = ["ts_number", "series", "name", "version", "url", "release"]
-
-            def matches_query(item: Dict[str, Any]) -> bool:
-                for field in search_fields:
-                    value = item.get(field)
-                    if isinstance(value, str) and needle in value.lower():
-                        return True
-                    if isinstance(value, (int, float)) and needle in str(value).lower():
-                        return True
-                return False
-
-            filtered = [item for item in filtered if matches_query(item)]
-
-    if query.series:
-        series = query.series.strip().lower()
-        if series:
-            filtered = [
-                item
-                for item in filtered
-                if isinstance(item.get("series"), str) and item["series"].strip().lower() == series
-            ]
-
-    if query.release is not None:
-        target_release = query.release
-        filtered = [
-            item
-            for item in filtered
-            if _coerce_release(item.get("release")) == target_release
-        ]
+        # Whitespace-separated terms must all appear, each in any searchable field
+        tokens = query.query.lower().split()
+        if len(tokens) == 1:
+            needle = tokens[0]
+            rows = [row for row in rows if needle in row.search_blob]
+        elif tokens:
+            rows = [row for row in rows if all(token in row.search_blob for token in tokens)]
 
     order_field = query.order_by or "ts_number"
-    allowed_fields = {"ts_number", "series", "release", "version", "name"}
-    if order_field not in allowed_fields:
+    if order_field not in SORT_FIELDS:
         order_field = "ts_number"
 
     reverse = query.normalized_direction() == "desc"
 
-    def sort_key(item: Dict[str, Any]) -> Any:
-        value = item.get(order_field)
-        if isinstance(value, str):
-            return value.lower()
-        return value if value is not None else ""
-
-    try:
-        filtered.sort(key=sort_key, reverse=reverse)
-    except TypeError:
-        filtered.sort(
-            key=lambda item: str(item.get(order_field, "")),
-            reverse=reverse,
-        )
-
-    total = len(filtered)
+    total = len(rows)
     page = query.page
     page_size = query.page_size
     start = (page - 1) * page_size
     end = start + page_size
-    paged_items = filtered[start:end]
+
+    # Shallow pages only need the first `end` rows in order; a bounded heap selects
+    # them in O(N log end) and matches what a full stable sort would return.
+    if end <= total // 4:
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        try:
+            rows = select(end, rows, key=operator.attrgetter(f"sort_{order_field}"))
+        except TypeError:
+            rows = select(end, rows, key=lambda row: str(row.item.get(order_field, "")))
+    else:
+        try:
+            rows = sorted(rows, key=operator.attrgetter(f"sort_{order_field}"), reverse=reverse)
+        except TypeError:
+            rows = sorted(rows, key=lambda row: str(row.item.get(order_field, "")), reverse=reverse)
+
+    paged_items = [row.item for row in rows[start:end]]
 
     return {
         "total": total,
         "page": page,
         "page_size": page_size,
-        "file_type": snapshot.get("current_file_type", "none"),
+        "file_type": catalog.file_type,
         "items": paged_items,
     }
 
 
+@app.post("/api/files")
+async def list_files(payload: Optional[FilesQuery] = Body(default=None)) -> Dict[str, Any]:
+    # The catalogue is an immutable snapshot, so the filter/sort runs in a worker thread
+    # without copying state or holding the state lock.
+    return await asyncio.to_thread(_query_files, payload or FilesQuery())
+
+
+_reload_lock = threading.Lock()
+_reload_future: Optional[Future] = None
+
+
+def _clear_reload(future: Future) -> None:
+    global _reload_future
+    with _reload_lock:
+        if _reload_future is future:
+            _reload_future = None
+
+
+def _reload_available_files() -> Future:
+    # Concurrent reload requests share one in-flight parse instead of each re-reading the manifest
+    global _reload_future
+    with _reload_lock:
+        future = _reload_future
+        created = future is None
+        if created:
+            future = _reload_future = _cpu_job_pool.submit(_load_available_files)
+    if created:
+        future.add_done_callback(_clear_reload)
+    return future
+
+
 @app.post("/api/files/reload")
-def reload_files() -> Dict[str, str]:
-    _load_available_files()
+async def reload_files() -> Dict[str, str]:
+    await asyncio.wrap_future(_reload_available_files())
     return {"message": "File catalogue refreshed"}
 
 
 @app.post("/api/logs/clear")
-def clear_logs() -> Dict[str, str]:
-    state_manager.log_messages = []
+async def clear_logs() -> Dict[str, str]:
+    state_manager.clear_logs()
     state_manager.add_log("Logs cleared")
     return {"message": "Logs cleared"}
 
@@ -563,21 +695,22 @@ if FRONTEND_DIST.exists():
     else:
         logger.info("Serving frontend assets from %s", FRONTEND_DIST)
 
-    @app.get("/", include_in_schema=False)
-    async def serve_index() -> FileResponse:  # type: ignore[return-value]
-        return FileResponse(index_path)
-
-    @app.get("/{full_path:path}", include_in_schema=False)
-    async def serve_spa(full_path: str) -> FileResponse:  # type: ignore[return-value]
-        candidate = FRONTEND_DIST / full_path
-        if candidate.is_file():
-            return FileResponse(candidate)
-        return FileResponse(index_path)
-
-    app.mount(
-        "/assets",
-        StaticFiles(directory=FRONTEND_DIST / "assets" if (FRONTEND_DIST / "assets").exists() else FRONTEND_DIST),
-        name="assets",
-    )
+    class _SpaStaticFiles(StaticFiles):
+        """Serve the built frontend, falling back to ``index.html`` for unknown paths."""
+
+        async def get_response(self, path: str, scope):  # type: ignore[override]
+            try:
+                response = await super().get_response(path, scope)
+            except StarletteHTTPException as exc:
+                if exc.status_code != 404:
+                    raise
+                return await super().get_response("index.html", scope)
+            if response.status_code == 404:
+                return await super().get_response("index.html", scope)
+            return response
+
+    # Mounted after every /api route so those still match first; Starlette handles
+    # path checks, ETag/Last-Modified and 304s without a Python handler per asset.
+    app.mount("/", _SpaStaticFiles(directory=FRONTEND_DIST, html=True), name="spa")
 else:
     logger.warning("Frontend dist directory %s not found; API will run without static assets", FRONTEND_DIST)
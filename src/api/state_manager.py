@@ -7,14 +7,14 @@ legacy experience.
 """
 from __future__ import annotations
 
-import json
 import os
+import queue
 import threading
 import time
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, timezone
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 try:  # Python 3.11+
     import tomllib
@@ -23,6 +23,8 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for older interpreter
 
 from pydantic import BaseModel
 
+from tools.manifest import dumps, loads
+
 _SETTINGS_PATH = Path("web_settings.json")
 
 
@@ -58,22 +60,147 @@ class UserSettings(BaseModel):
         extra = "allow"
 
 
-@dataclass
+def coerce_release(value: Any) -> Optional[int]:
+    """Best-effort conversion of a manifest ``release`` value to an int."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+SEARCH_FIELDS = ("ts_number", "series", "name", "version", "url", "release")
+SORT_FIELDS = ("ts_number", "series", "release", "version", "name")
+# Joins per-field search text; a needle containing it could otherwise span two fields.
+_SEARCH_SEPARATOR = "\x00"
+
+
+@dataclass(frozen=True)
+class FileRow:
+    """A catalogue entry plus the lookup keys ``/api/files`` needs, computed once at load."""
+
+    item: Dict
+    search_blob: str
+    series: Optional[str]
+    release: Optional[int]
+    # One attribute per SORT_FIELDS entry so sorting can use a C-level attrgetter key
+    sort_ts_number: Any
+    sort_series: Any
+    sort_release: Any
+    sort_version: Any
+    sort_name: Any
+
+    @classmethod
+    def from_item(cls, item: Dict) -> "FileRow":
+        parts = []
+        for name in SEARCH_FIELDS:
+            value = item.get(name)
+            if isinstance(value, str):
+                parts.append(value.lower())
+            elif isinstance(value, (int, float)):
+                parts.append(str(value).lower())
+        sort_keys = {}
+        for name in SORT_FIELDS:
+            value = item.get(name)
+            sort_keys[f"sort_{name}"] = value.lower() if isinstance(value, str) else (value if value is not None else "")
+        series = item.get("series")
+        return cls(
+            item=item,
+            search_blob=_SEARCH_SEPARATOR.join(parts),
+            series=series.strip().lower() if isinstance(series, str) else None,
+            release=coerce_release(item.get("release")),
+            **sort_keys,
+        )
+
+
+class FileCatalog:
+    """Immutable snapshot of the available files with precomputed search/sort rows.
+
+    A new catalogue replaces the old one on every load, so readers can keep using
+    the instance they got without holding the state lock or copying it.
+    """
+
+    def __init__(self, files: List[Dict], file_type: str = "none") -> None:
+        self.files = files
+        self.file_type = file_type
+        # Pre-encoded for /api/state, which would otherwise re-encode the whole list per poll
+        self.files_json = dumps(files)
+        self.rows = [FileRow.from_item(item) for item in files]
+        # Exact-match buckets (row positions, in catalogue order) for the series/release filters
+        self.series_index: Dict[str, List[int]] = {}
+        self.release_index: Dict[int, List[int]] = {}
+        self.by_url: Dict[str, Dict] = {}
+        for item in files:
+            url = item.get("url")
+            if url:
+                self.by_url.setdefault(url, item)
+        for position, row in enumerate(self.rows):
+            if row.series is not None:
+                self.series_index.setdefault(row.series, []).append(position)
+            if row.release is not None:
+                self.release_index.setdefault(row.release, []).append(position)
+
+    def select(self, series: Optional[str] = None, release: Optional[int] = None) -> List[FileRow]:
+        """Return the rows matching the normalised *series* and/or *release*, in catalogue order."""
+        buckets = []
+        if series is not None:
+            buckets.append(self.series_index.get(series, []))
+        if release is not None:
+            buckets.append(self.release_index.get(release, []))
+        if not buckets:
+            return self.rows
+        if len(buckets) == 1:
+            positions = buckets[0]
+        else:
+            smaller, larger = sorted(buckets, key=len)
+            wanted = set(larger)
+            positions = [position for position in smaller if position in wanted]
+        return [self.rows[position] for position in positions]
+
+
+# (second, "HH:MM:SS") for the last second a log timestamp was requested
+_stamp_cache: Tuple[int, str] = (-1, "")
+
+
+def _clock_stamp() -> str:
+    """Return the local HH:MM:SS for the current second, formatting once per second."""
+    global _stamp_cache
+    now = int(time.time())
+    cached = _stamp_cache
+    if cached[0] != now:
+        cached = _stamp_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+    return cached[1]
+
+
+@dataclass(slots=True)
 class DownloadEvent:
-    timestamp: str
+    timestamp: int  # nanoseconds since the Unix epoch
     filename: str
     status: str
     description: str
 
-    def as_dict(self) -> Dict[str, str]:
-        return asdict(self)
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "filename": self.filename,
+            "status": self.status,
+            "description": self.description,
+        }
 
 
 class StateManager:
     """Thread-safe holder for runtime telemetry and settings."""
 
     def __init__(self) -> None:
-        self._lock = threading.RLock()
+        # Plain Lock: no method calls another locking method while holding it
+        self._lock = threading.Lock()
         self.settings = UserSettings()
         self.scraping_status = "idle"
         self.download_status = "idle"
@@ -81,14 +208,35 @@ class StateManager:
         self.download_progress = 0.0
         self.current_operation = ""
         self.current_download_item: Optional[str] = None
-        self.log_messages: List[str] = []
+        self.log_messages: Deque[str] = deque(maxlen=max(1, self.settings.web_max_log_messages))
+        # Producers enqueue log lines without taking the state lock; readers drain them
+        self._log_queue: "queue.SimpleQueue[str]" = queue.SimpleQueue()
         self.available_files: List[Dict] = []
         self.current_file_type: str = "none"
-        self.completed_downloads: List[str] = []
-        self.failed_downloads: List[str] = []
-        self.recent_download_events: List[DownloadEvent] = []
+        self.file_catalog = FileCatalog([])
+        self.completed_downloads: Deque[str] = deque(maxlen=32)
+        self.failed_downloads: Deque[str] = deque(maxlen=32)
+        self.recent_download_events: Deque[DownloadEvent] = deque(maxlen=12)
         self.last_update = time.time()
         self.app_version = self._resolve_app_version()
+        self._active_jobs: set = set()
+        # Bumped by every mutation; lets snapshot_bytes() reuse the last encoded state
+        self._version = 0
+        self._snapshot_cache: Optional[Tuple[int, bytes]] = None
+        # Bytes last read from or written to the settings file
+        self._saved_settings: Optional[bytes] = None
+        # Serialises settings-file writes so disk I/O never runs under the state lock
+        self._settings_io_lock = threading.Lock()
+
+    @property
+    def settings(self) -> UserSettings:
+        return self._settings
+
+    @settings.setter
+    def settings(self, value: UserSettings) -> None:
+        # Dumped once per change rather than on every snapshot
+        self._settings = value
+        self._settings_dump = value.model_dump()
 
     # ------------------------------------------------------------------
     # Persistence helpers
@@ -97,17 +245,54 @@ class StateManager:
         """Load settings from disk if available."""
         if _SETTINGS_PATH.exists():
             try:
-                data = json.loads(_SETTINGS_PATH.read_text())
-                self.settings = UserSettings(**data)
+                raw = _SETTINGS_PATH.read_bytes()
+                self.settings = UserSettings(**loads(raw))
+                self._saved_settings = raw
             except Exception:
                 # fall back to defaults but keep file for troubleshooting
                 self.settings = UserSettings()
         else:
             self.save_settings()
+        with self._lock:
+            self._resize_logs()
+            self._touch()
 
     def save_settings(self) -> None:
-        """Persist the current settings to disk."""
-        _SETTINGS_PATH.write_text(self.settings.model_dump_json(indent=2))
+        """Persist the current settings to disk; call without the state lock held.
+
+        The file is written to a temporary sibling and renamed into place, so readers
+        never see a torn file; unchanged settings are not rewritten at all. Settings are
+        dumped under the state lock but written outside it, and the dump is taken inside
+        the write lock, so concurrent saves always leave the newest settings on disk.
+        """
+        with self._settings_io_lock:
+            with self._lock:
+                payload = self.settings.model_dump_json(indent=2).encode("utf-8")
+            if payload == self._saved_settings:
+                return
+            tmp_path = _SETTINGS_PATH.with_name(_SETTINGS_PATH.name + ".tmp")
+            with tmp_path.open("wb") as handle:
+                handle.write(payload)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, _SETTINGS_PATH)
+            self._saved_settings = payload
+
+    # ------------------------------------------------------------------
+    # Job slots
+    # ------------------------------------------------------------------
+    def try_begin_job(self, name: str) -> bool:
+        """Atomically claim the *name* job slot; False when that job is already active."""
+        with self._lock:
+            if name in self._active_jobs:
+                return False
+            self._active_jobs.add(name)
+            return True
+
+    def end_job(self, name: str) -> None:
+        """Release the *name* job slot claimed by :meth:`try_begin_job`."""
+        with self._lock:
+            self._active_jobs.discard(name)
 
     # ------------------------------------------------------------------
     # Mutation helpers
@@ -118,76 +303,110 @@ class StateManager:
             self.scraping_progress = max(0.0, min(100.0, progress))
             if message:
                 self.current_operation = message
-                self.add_log(message)
             self._touch()
+        if message:
+            self.add_log(message)
 
     def set_download_status(self, status: str, progress: float, message: Optional[str] = None) -> None:
         with self._lock:
-            self.download_status = status
-            self.download_progress = max(0.0, min(100.0, progress))
-            if message:
-                self.current_operation = message
-                self.add_log(message)
-            self._touch()
+            self._set_download_status(status, progress, message)
+        if message:
+            self.add_log(message)
+
+    def set_download_item_status(self, filename: Optional[str], status: str, progress: float, message: Optional[str] = None) -> None:
+        """Update the current download item and the download status under one lock acquisition."""
+        with self._lock:
+            self.current_download_item = filename
+            self._set_download_status(status, progress, message)
+        if message:
+            self.add_log(message)
+
+    def _set_download_status(self, status: str, progress: float, message: Optional[str]) -> None:
+        """Shared body of the download status setters; call with the lock held."""
+        self.download_status = status
+        self.download_progress = max(0.0, min(100.0, progress))
+        if message:
+            self.current_operation = message
+        self._touch()
 
     def update_current_operation(self, message: str) -> None:
         with self._lock:
             self.current_operation = message
-            self.add_log(message)
             self._touch()
+        self.add_log(message)
 
     def add_log(self, message: str) -> None:
-        timestamp = time.strftime("%H:%M:%S")
-        entry = f"[{timestamp}] {message}"
-        max_msgs = max(1, self.settings.web_max_log_messages)
-        with self._lock:
-            self.log_messages.append(entry)
-            if len(self.log_messages) > max_msgs:
-                self.log_messages = self.log_messages[-max_msgs:]
-            self._touch()
+        self.add_logs([message])
+
+    def add_logs(self, messages: List[str]) -> None:
+        """Queue several log lines under one timestamp; no state lock is taken."""
+        timestamp = _clock_stamp()
+        for message in messages:
+            self._log_queue.put_nowait(f"[{timestamp}] {message}")
+        # Without a poller nothing drains the queue; fold it in once it outgrows the buffer.
+        # Never wait for the lock here: whoever holds it will drain soon enough.
+        if self._log_queue.qsize() >= (self.log_messages.maxlen or 1) and self._lock.acquire(blocking=False):
+            try:
+                self._drain_logs()
+            finally:
+                self._lock.release()
 
     def clear_logs(self) -> None:
         with self._lock:
-            self.log_messages = []
+            self._drain_logs()
+            self.log_messages.clear()
+            self._touch()
+
+    def _drain_logs(self) -> None:
+        """Move queued log lines into the bounded buffer; call with the lock held."""
+        drained = False
+        while True:
+            try:
+                line = self._log_queue.get_nowait()
+            except queue.Empty:
+                break
+            # Bounded deque: the oldest lines fall off as new ones arrive
+            self.log_messages.append(line)
+            drained = True
+        if drained:
             self._touch()
 
     def set_available_files(self, files: List[Dict], file_type: str) -> None:
+        catalog = FileCatalog(files, file_type)  # built outside the lock; it only reads *files*
         with self._lock:
             self.available_files = files
             self.current_file_type = file_type
-            count = len(files)
-            self.add_log(f"Loaded {count} available file{'s' if count != 1 else ''} ({file_type})")
+            self.file_catalog = catalog
             self._touch()
+        count = len(files)
+        self.add_log(f"Loaded {count} available file{'s' if count != 1 else ''} ({file_type})")
 
     def clear_files(self) -> None:
         with self._lock:
             self.available_files = []
             self.current_file_type = "none"
+            self.file_catalog = FileCatalog([])
             self._touch()
 
     def record_download_event(self, filename: str, status: str, description: str) -> None:
         event = DownloadEvent(
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=time.time_ns(),
             filename=filename,
             status=status,
             description=description,
         )
         with self._lock:
             self.recent_download_events.append(event)
-            if len(self.recent_download_events) > 12:
-                self.recent_download_events = self.recent_download_events[-12:]
             self._touch()
 
     def append_completed(self, filename: str) -> None:
         with self._lock:
             self.completed_downloads.append(filename)
-            self.completed_downloads = self.completed_downloads[-32:]
             self._touch()
 
     def append_failed(self, filename: str) -> None:
         with self._lock:
             self.failed_downloads.append(filename)
-            self.failed_downloads = self.failed_downloads[-32:]
             self._touch()
 
     def reset_download_tracking(self) -> None:
@@ -195,9 +414,9 @@ class StateManager:
             self.download_status = "running"
             self.download_progress = 0.0
             self.current_download_item = None
-            self.completed_downloads = []
-            self.failed_downloads = []
-            self.recent_download_events = []
+            self.completed_downloads.clear()
+            self.failed_downloads.clear()
+            self.recent_download_events.clear()
             self._touch()
 
     def update_current_download_item(self, filename: Optional[str]) -> None:
@@ -209,41 +428,74 @@ class StateManager:
         with self._lock:
             new_settings = self.settings.model_copy(update=updates)
             self.settings = new_settings
-            self.save_settings()
+            self._resize_logs()
             self._touch()
-            return new_settings.model_dump()
+            result = dict(self._settings_dump)
+        self.save_settings()
+        return result
 
     def set_verbose_logging(self, enabled: bool) -> None:
         with self._lock:
             self.settings = self.settings.model_copy(update={"verbose_logging": enabled})
-            self.save_settings()
             self._touch()
+        self.save_settings()
+
+    def _resize_logs(self) -> None:
+        """Re-bound the log buffer after ``web_max_log_messages`` may have changed; call with the lock held."""
+        max_msgs = max(1, self.settings.web_max_log_messages)
+        if self.log_messages.maxlen != max_msgs:
+            self.log_messages = deque(self.log_messages, maxlen=max_msgs)
 
     def _touch(self) -> None:
         self.last_update = time.time()
+        self._version += 1
 
     # ------------------------------------------------------------------
     # Snapshot helpers
     # ------------------------------------------------------------------
     def snapshot(self) -> Dict:
         with self._lock:
-            return {
-                "scraping_status": self.scraping_status,
-                "download_status": self.download_status,
-                "scraping_progress": self.scraping_progress,
-                "download_progress": self.download_progress,
-                "current_operation": self.current_operation,
-                "current_download_item": self.current_download_item,
-                "log_messages": list(self.log_messages),
-                "available_files": list(self.available_files),
-                "current_file_type": self.current_file_type,
-                "completed_downloads": list(self.completed_downloads),
-                "failed_downloads": list(self.failed_downloads),
-                "recent_download_events": [event.as_dict() for event in self.recent_download_events],
-                "last_update": self.last_update,
-                "settings": self.settings.model_dump(),
-                "app_version": self.app_version,
-            }
+            state = self._snapshot_fields()
+            state["available_files"] = list(self.available_files)
+            return state
+
+    def _snapshot_fields(self) -> Dict:
+        """Everything in :meth:`snapshot` except ``available_files``; call with the lock held."""
+        self._drain_logs()
+        return {
+            "scraping_status": self.scraping_status,
+            "download_status": self.download_status,
+            "scraping_progress": self.scraping_progress,
+            "download_progress": self.download_progress,
+            "current_operation": self.current_operation,
+            "current_download_item": self.current_download_item,
+            "log_messages": list(self.log_messages),
+            "current_file_type": self.current_file_type,
+            "completed_downloads": list(self.completed_downloads),
+            "failed_downloads": list(self.failed_downloads),
+            "recent_download_events": [event.as_dict() for event in self.recent_download_events],
+            "last_update": self.last_update,
+            "settings": dict(self._settings_dump),
+            "app_version": self.app_version,
+        }
+
+    def snapshot_bytes(self) -> bytes:
+        """Return :meth:`snapshot` encoded as JSON, re-encoding only after a mutation."""
+        with self._lock:
+            self._drain_logs()
+            cached = self._snapshot_cache
+            if cached is not None and cached[0] == self._version:
+                return cached[1]
+            version = self._version
+            state = self._snapshot_fields()
+            files_json = self.file_catalog.files_json
+        # Encoded outside the lock (the fields are copies); the catalogue was encoded once
+        # at load, so only the small fields are re-encoded per mutation.
+        payload = dumps(state)[:-1] + b',"available_files":' + files_json + b"}"
+        with self._lock:
+            if self._version == version:
+                self._snapshot_cache = (version, payload)
+        return payload
 
     def _resolve_app_version(self) -> str:
         """Determine a human-friendly version string for the UI."""
@@ -266,7 +518,7 @@ class StateManager:
         package_path = Path("frontend/package.json")
         if package_path.exists():
             try:
-                data = json.loads(package_path.read_text())
+                data = loads(package_path.read_bytes())
                 version = data.get("version")
                 if isinstance(version, str) and version.strip():
                     return version.strip()
@@ -277,17 +529,22 @@ class StateManager:
 
     def get_settings(self) -> Dict:
         with self._lock:
-            return self.settings.model_dump()
+            return dict(self._settings_dump)
 
     # ------------------------------------------------------------------
     # Utilities
     # ------------------------------------------------------------------
     def ensure_download_selection(self, urls: List[str]) -> Tuple[List[Dict], List[str]]:
         """Return matching file objects for the provided URLs."""
-        with self._lock:
-            matched = [f for f in self.available_files if f.get("url") in urls]
-        found_urls = [f.get("url") for f in matched if f.get("url")]
-        missing = [url for url in urls if url not in found_urls]
+        by_url = self.file_catalog.by_url
+        matched: List[Dict] = []
+        missing: List[str] = []
+        for url in dict.fromkeys(urls):
+            item = by_url.get(url)
+            if item is None:
+                missing.append(url)
+            else:
+                matched.append(item)
         return matched, missing
 
 
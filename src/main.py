@@ -1,28 +1,20 @@
 # Main script to run the 3GPP downloader
 import atexit
-from multiprocessing import pool
+import contextlib
+import importlib.util
 import os
-import re
 import sys
 import argparse
-import json
 from pathlib import Path
-from threading import Timer, Event
+import threading
+from threading import Event
 import signal
-from typing import Callable, Dict, Optional
-from tools.etsi_spider import EtsiSpider
-from scrapy.crawler import CrawlerProcess
-from tools.monitored_pool import MonitoredPoolManager
+from typing import Callable, Dict, List, Optional, Union
 import logging
 from utils.logging_config import setup_logger
 import time
-from tools.json_downloader import download_from_json
 from tools.filtering import filter_latest_records
-
-try:
-    from api.extensions.scrape_progress import EXTENSION_PATH as PROGRESS_EXTENSION
-except Exception:  # pragma: no cover - optional extension
-    PROGRESS_EXTENSION = None
+from tools.manifest import count_records, iter_records, write_records
 
 
 #configure logger
@@ -35,20 +27,77 @@ backup_count = int(os.getenv('MAIN_BACKUP_COUNT', '5'))
 
 logger = setup_logger(logger_name, log_file=logging_file, console_level=console_level, logfile_level=file_level, max_bytes=max_bytes, backup_count=backup_count)
 
+# Scraper output: links.jsonl, or links.json left behind by releases that wrote a JSON array
+_LINKS_CANDIDATES = (Path('downloads/links.jsonl'), Path('downloads/links.json'))
+
+def _find_links_manifest() -> Optional[Path]:
+    """Return the first scraped links manifest that exists, or None."""
+    return next((candidate for candidate in _LINKS_CANDIDATES if candidate.exists()), None)
+
+def _remove_manifests() -> None:
+    """Delete the scraped and filtered manifests once their downloads have completed."""
+    for candidate in _LINKS_CANDIDATES:
+        candidate.unlink(missing_ok=True)
+    Path('downloads/latest.json').unlink(missing_ok=True)
+
 def signal_handler(signum, frame):
-    logger.info(f"Received signal {signum}, exiting gracefully...")
+    logger.info("Received signal %s, exiting gracefully...", signum)
     sys.exit(0)
 
-def cleanup(pool):
+# Event loop and HTTP session shared by successive download_pdfs() calls (the API server runs
+# one per download job), so keep-alive connections to the ETSI host survive between runs.
+_download_lock = threading.Lock()
+_download_loop = None
+_download_session = None  # (concurrency, aiohttp.ClientSession)
+
+def _get_download_loop():
+    global _download_loop
+    if _download_loop is None or _download_loop.is_closed():
+        import asyncio
+
+        try:  # optional libuv-based event loop (installed with uvicorn[standard])
+            import uvloop
+        except ModuleNotFoundError:  # pragma: no cover - optional dependency
+            _download_loop = asyncio.DefaultEventLoopPolicy().new_event_loop()
+        else:
+            _download_loop = uvloop.new_event_loop()
+    return _download_loop
+
+async def _get_download_session(concurrency: int):
+    global _download_session
+    from tools.json_downloader import get_download_session
+
+    if _download_session is not None:
+        size, session = _download_session
+        if size == concurrency and not session.closed:
+            return session
+        await session.close()
+    _download_session = (concurrency, get_download_session(concurrency))
+    return _download_session[1]
+
+def close_download_runtime() -> None:
     """
-    Cleanup function to clear connection pools at exit
+    Close the HTTP session and event loop kept between download_pdfs() calls
     """
-    logger.info(f"Cleaning up HTTPS connection pools at exit...")
-    pool.clear()
-    logger.info(f"Cleaned up HTTPS connection pools at exit...")
+    global _download_loop, _download_session
+    with _download_lock:
+        loop, _download_loop = _download_loop, None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            if _download_session is not None:
+                loop.run_until_complete(_download_session[1].close())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            _download_session = None
+            loop.close()
+
+# Fallback for library callers (e.g. the API server); main() closes the runtime itself.
+# close_download_runtime is a no-op when no loop was ever created.
+atexit.register(close_download_runtime)
 
 def download_pdfs(
-    input_file: str = 'latest.json',
+    input_file: Union[str, List[Dict]] = 'latest.json',
     dest_dir: str = 'downloads/pdfs',
     concurrency: int = 5,
     callback=None,
@@ -58,7 +107,7 @@ def download_pdfs(
     Downloads PDFs from the provided JSON file containing links.
     
     Args:
-        input_file (str): Path to the input JSON file (default: 'latest.json')
+        input_file (str | list[dict]): Path to the input JSON file, or its already-loaded records (default: 'latest.json')
         dest_dir (str): Directory to save the downloaded PDFs (default: 'downloads/pdfs')
         concurrency (int): Number of concurrent downloads (default: 5)
     callback (callable): Optional callback function to call after each download
@@ -67,99 +116,141 @@ def download_pdfs(
     Returns:
         bool: True if downloads were successful, False otherwise
     """
+    # Imported here so CLI paths that never download skip loading aiohttp
+    from tools.json_downloader import download_from_json
+
     # Create the destination directory if it doesn't exist
     dest_path = Path(dest_dir)
     dest_path.mkdir(parents=True, exist_ok=True)
 
     import asyncio
 
-    loop = asyncio.DefaultEventLoopPolicy().new_event_loop()
-    try:
-        asyncio.set_event_loop(loop)
-        result = loop.run_until_complete(
-            download_from_json(
-                src_file=input_file,
-                dest_dir=str(dest_path),
-                concurrency=concurrency,
-                progress_callback=callback,
-                cancel_event=cancel_event,
-            )
+    async def run():
+        return await download_from_json(
+            src_file=input_file,
+            dest_dir=str(dest_path),
+            concurrency=concurrency,
+            progress_callback=callback,
+            cancel_event=cancel_event,
+            session=await _get_download_session(concurrency),
         )
-    except asyncio.CancelledError:
-        logger.info("Download cancelled by user")
-        return False
-    finally:
+
+    with _download_lock:
+        loop = _get_download_loop()
         try:
-            loop.run_until_complete(loop.shutdown_asyncgens())
+            asyncio.set_event_loop(loop)
+            task = loop.create_task(run())
+            try:
+                result = loop.run_until_complete(task)
+            except (KeyboardInterrupt, SystemExit):
+                # Ctrl-C / SIGTERM: unwind the downloader so it persists the download cache
+                # before the process exits; the shared session is closed by close_download_runtime.
+                task.cancel()
+                with contextlib.suppress(BaseException):
+                    loop.run_until_complete(task)
+                raise
+        except asyncio.CancelledError:
+            logger.info("Download cancelled by user")
+            return False
         finally:
             asyncio.set_event_loop(None)
-            loop.close()
 
     return bool(result)
 
-def filter_latest_versions(input_file: str = 'links.json', output_file: str = 'latest.json') -> bool:
+def filter_latest_versions(input_file: str = 'links.jsonl', output_file: str = 'latest.json') -> Optional[List[Dict]]:
     """
-    Reads the input JSON file, filters to keep only the latest version for each ts_number,
+    Reads the input manifest (JSON Lines or JSON array), filters to keep only the latest version for each ts_number,
     and writes the filtered data to the output JSON file.
     
     Args:
-        input_file (str): Path to the input JSON file (default: 'links.json')
+        input_file (str): Path to the input manifest (default: 'links.jsonl')
         output_file (str): Path to the output JSON file (default: 'latest.json')
+
+    Returns:
+        list[dict] | None: The filtered records (also written to *output_file*, which is kept for resume),
+        so callers can download them without re-reading the file; None when filtering failed.
     """
     # Measure the time taken for filtering
     start_time = time.time()
-    logger.info(f"Filtering latest versions from {input_file} to {output_file}...")
+    logger.info("Filtering latest versions from %s to %s...", input_file, output_file)
     input_path = Path(input_file)
     if not input_path.exists():
-        logger.error(f"Input file {input_file} does not exist.")
+        logger.error("Input file %s does not exist.", input_file)
         end_time = time.time()
         elapsed = end_time - start_time
-        logger.info(f"Filtering failed in {elapsed:.2f} seconds.")
-        return False
+        logger.info("Filtering failed in %.2f seconds.", elapsed)
+        return None
     
-    with input_path.open('r') as f:
-        data = json.load(f)
-    
-    if not data:
+    # Records are filtered as they are parsed, so the full manifest is never held in memory
+    total_items = 0
+
+    def counted_records():
+        nonlocal total_items
+        for record in iter_records(input_path):
+            total_items += 1
+            yield record
+
+    filtered, skipped_items = filter_latest_records(counted_records())
+
+    if not total_items:
         logger.warning("No data in input file.")
         end_time = time.time()
         elapsed = end_time - start_time
-        logger.info(f"Filtering failed in {elapsed:.2f} seconds.")
-        return False
-
-    filtered, skipped_items = filter_latest_records(data)
+        logger.info("Filtering failed in %.2f seconds.", elapsed)
+        return None
 
     if skipped_items:
         logger.warning(
-            f"Skipped {skipped_items} entries missing ts_number/version while filtering {input_file}."
+            "Skipped %s entries missing ts_number/version while filtering %s.", skipped_items, input_file
         )
 
     if not filtered:
         logger.error("No valid specifications found after filtering; aborting.")
-        return False
+        return None
 
     # Write to output file
     output_path = Path(output_file)
-    with output_path.open('w') as f:
-        json.dump(filtered, f, indent=2)
+    # Compact unless debugging; the API and downloader are the only readers
+    write_records(output_path, filtered, indent=2 if logger.isEnabledFor(logging.DEBUG) else None)
     
     end_time = time.time()
     elapsed = end_time - start_time
     logger.info(
-        f"Filtered {len(data)} items to {len(filtered)} latest versions in {output_file} in {elapsed:.2f} seconds."
+        "Filtered %s items to %s latest versions in %s in %.2f seconds.", total_items, len(filtered), output_file, elapsed
     )
-    return True
+    return filtered
 
 # Function to invoke the scrapy class and trigger the scraping
 def run_scraper(
     logging_lvl: int = logging.INFO,
     logfile: str = 'logs/scrapy.log',
-    progress_callback: Optional[Callable[[float, Dict[str, int]], None]] = None,
+    progress_callback: Optional[Callable[[float, Dict[str, int], Optional[str]], None]] = None,
+    download_dir: Optional[str] = None,
+    download_concurrency: int = 5,
+    download_callback=None,
+    latest_output: Optional[str] = None,
 ) -> dict:
     """
     Function to invoke the scrapy class and trigger the scraping
+
+    When *latest_output* is given, items are filtered to the latest versions as they are
+    scraped and the result is written there when the crawl ends (``latest_version_count``
+    stat). When *download_dir* is given the PDFs are downloaded there within the same
+    process: the filtered ones once the crawl ends, or with no *latest_output* every
+    scraped PDF while the crawl is still running. The result is reported in the
+    ``pdf_download_success`` stat.
     """
-    logger.info(f"Starting scraper for the links...")
+    # Scrapy pulls in Twisted, lxml and friends; only pay for that when actually scraping
+    from scrapy.crawler import CrawlerProcess
+    from tools.etsi_spider import EtsiSpider
+    from tools.exporters import EXPORTER_PATH
+
+    try:
+        from api.extensions.scrape_progress import EXTENSION_PATH as PROGRESS_EXTENSION
+    except Exception:  # pragma: no cover - optional extension
+        PROGRESS_EXTENSION = None
+
+    logger.info("Starting scraper for the links...")
     # Define the format string with placeholders
     # - asctime: For date/time
     # - filename: Source file name
@@ -176,8 +267,9 @@ def run_scraper(
 
     settings = {
         'FEEDS': {
-            'downloads/links.json': {'format': 'json', 'overwrite': True}
+            'downloads/links.jsonl': {'format': 'jsonlines', 'overwrite': True}
         },
+        'FEED_EXPORTERS': {'jsonlines': EXPORTER_PATH},
         'USER_AGENT': os.getenv('SCRAPY_USER_AGENT', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'),
         'ROBOTSTXT_OBEY': True,
         'CONCURRENT_REQUESTS': int(os.getenv('SCRAPY_CONCURRENT_REQUESTS_PER_DOMAIN', '32')),
@@ -187,36 +279,61 @@ def run_scraper(
         'LOG_LEVEL': logging_lvl,
         'LOG_FORMAT': default_fmt,
         'LOG_DATEFORMAT': date_fmt,
+        # The asyncio reactor also lets pipelines run downloads on the crawl's own loop
+        'TWISTED_REACTOR': 'twisted.internet.asyncioreactor.AsyncioSelectorReactor',
     }
+    if importlib.util.find_spec('uvloop') is not None:
+        # Checked without importing: Scrapy loads the loop class itself
+        settings['ASYNCIO_EVENT_LOOP'] = 'uvloop.Loop'
+    if os.getenv('SCRAPY_ENABLE_HTTP2', 'false').lower() == 'true':
+        # Every listing page comes from one origin; multiplex them over a single TLS connection
+        settings['DOWNLOAD_HANDLERS'] = {'https': 'scrapy.core.downloader.handlers.http2.H2DownloadHandler'}
+    if os.getenv('SCRAPY_AUTOTHROTTLE', 'false').lower() == 'true':
+        # Let latency drive the request rate instead of the fixed DOWNLOAD_DELAY
+        settings['AUTOTHROTTLE_ENABLED'] = True
+        settings['AUTOTHROTTLE_TARGET_CONCURRENCY'] = float(os.getenv('SCRAPY_AUTOTHROTTLE_TARGET_CONCURRENCY', '8'))
     if PROGRESS_EXTENSION:
         settings.setdefault('EXTENSIONS', {})[PROGRESS_EXTENSION] = 5
         if progress_callback:
             settings['SCRAPE_PROGRESS_CALLBACK'] = progress_callback
+    if latest_output:
+        from tools.pipelines import LATEST_PIPELINE_PATH
+
+        # Filtered in-process instead of re-reading links.jsonl afterwards
+        settings['ITEM_PIPELINES'] = {LATEST_PIPELINE_PATH: 200}
+        settings['LATEST_VERSIONS_OUTPUT'] = latest_output
+    elif download_dir:
+        from tools.pipelines import PIPELINE_PATH
+
+        settings['ITEM_PIPELINES'] = {PIPELINE_PATH: 300}
+    if download_dir:
+        settings['PDF_DOWNLOAD_DIR'] = download_dir
+        settings['PDF_DOWNLOAD_CONCURRENCY'] = download_concurrency
+        settings['PDF_DOWNLOAD_CALLBACK'] = download_callback
 
     process = CrawlerProcess(settings=settings)
     # Start the crawling using the EtsiSpider
-    process.crawl(EtsiSpider)
+    crawler = process.create_crawler(EtsiSpider)
+    process.crawl(crawler)
     # Measure the time taken for scraping
     start_time = time.time()
     logger.info("Scraping started...")
     process.start(install_signal_handlers=False)
     end_time = time.time()
     elapsed = end_time - start_time
-    logger.info(f"Scraping completed in {elapsed:.2f} seconds.")
+    logger.info("Scraping completed in %.2f seconds.", elapsed)
 
-    # Safely attempt to collect scrapy stats. Some CrawlerProcess versions may not
-    # expose a .stats attribute after start(); avoid raising an exception here so
-    # the caller can still rely on the produced artifact (downloads/links.json)
+    # Safely attempt to collect scrapy stats from the crawler; avoid raising an exception
+    # here so the caller can still rely on the produced artifact (downloads/links.jsonl)
     stats = {}
     try:
-        if hasattr(process, "stats") and getattr(process.stats, "get_stats", None):
-            stats = process.stats.get_stats() or {}
+        stats = dict(crawler.stats.get_stats() or {})
     except Exception as exc:  # pragma: no cover - defensive
-        logger.warning(f"Unable to collect scrapy stats from process: {exc}")
-    links_path = Path('downloads/links.json')
+        logger.warning("Unable to collect scrapy stats from process: %s", exc)
+    links_path = Path('downloads/links.jsonl')
 
     if stats:
-        logger.info(f"Scrapy stats collected: {stats}")
+        logger.info("Scrapy stats collected: %s", stats)
     else:
         logger.warning("Scrapy stats collector returned empty results.")
 
@@ -226,12 +343,10 @@ def run_scraper(
     # If item_scraped_count is missing but the file exists, approximate via file length
     if stats['links_output_exists'] and 'item_scraped_count' not in stats:
         try:
-            with links_path.open('r') as handle:
-                scraped_items = json.load(handle)
-            stats['item_scraped_count'] = len(scraped_items)
-            logger.info(f"Derived item count from links.json: {stats['item_scraped_count']}")
+            stats['item_scraped_count'] = count_records(links_path)
+            logger.info("Derived item count from links.jsonl: %s", stats['item_scraped_count'])
         except Exception as exc:
-            logger.warning(f"Unable to derive item count from links.json: {exc}")
+            logger.warning("Unable to derive item count from links.jsonl: %s", exc)
 
     # Treat scraping as successful when we actually produced items
     scraped_count = stats.get('item_scraped_count', 0)
@@ -239,16 +354,14 @@ def run_scraper(
 
     if not stats['scrape_success'] and stats['links_output_exists']:
         try:
-            with links_path.open('r') as handle:
-                scraped_items = json.load(handle)
-            scraped_count = len(scraped_items)
+            scraped_count = count_records(links_path)
             stats['item_scraped_count'] = scraped_count
             stats['scrape_success'] = scraped_count > 0
             logger.info(
-                "Verified scrape results from links.json: %s item(s) present", scraped_count
+                "Verified scrape results from links.jsonl: %s item(s) present", scraped_count
             )
         except Exception as exc:
-            logger.warning("Unable to verify links.json contents: %s", exc)
+            logger.warning("Unable to verify links.jsonl contents: %s", exc)
 
     if not stats['scrape_success']:
         logger.error("Scraping completed without producing any items.")
@@ -263,14 +376,14 @@ def scrape_data() -> bool:
     try:
         logger.info("Starting scraping from web interface...")
         stats = run_scraper()
-        if stats:
+        if stats.get('scrape_success'):
             logger.info("Scraping completed successfully")
             return True
         else:
             logger.error("Scraping failed")
             return False
     except Exception as e:
-        logger.error(f"Scraping error: {e}")
+        logger.error("Scraping error: %s", e)
         return False
 
 def download_data(input_file: str = 'latest.json') -> bool:
@@ -279,7 +392,7 @@ def download_data(input_file: str = 'latest.json') -> bool:
     Returns True if successful, False otherwise
     """
     try:
-        logger.info(f"Starting download from {input_file}...")
+        logger.info("Starting download from %s...", input_file)
         success = download_pdfs(input_file=input_file)
         if success:
             logger.info("Download completed successfully")
@@ -288,7 +401,7 @@ def download_data(input_file: str = 'latest.json') -> bool:
             logger.error("Download failed")
             return False
     except Exception as e:
-        logger.error(f"Download error: {e}")
+        logger.error("Download error: %s", e)
         return False
 
 def scrape_data_with_config(
@@ -299,7 +412,7 @@ def scrape_data_with_config(
     specific_release: int = None,
     threads: int = 5,
     verbose: bool = False,
-    progress_callback: Optional[Callable[[float, Dict[str, int]], None]] = None,
+    progress_callback: Optional[Callable[[float, Dict[str, int], Optional[str]], None]] = None,
 ) -> bool:
     """
     Enhanced scraping function with configuration options
@@ -313,7 +426,7 @@ def scrape_data_with_config(
         if resume:
             logger.info("Resume mode: checking for existing files...")
             # Resume logic - check for existing files and skip scraping if possible
-            if Path('downloads/links.json').exists() or Path('downloads/latest.json').exists():
+            if _find_links_manifest() or Path('downloads/latest.json').exists():
                 logger.info("Found existing files, skipping scraping in resume mode")
                 return True
             else:
@@ -323,18 +436,18 @@ def scrape_data_with_config(
             logging_lvl=logging.DEBUG if verbose else logging.INFO,
             progress_callback=progress_callback,
         )
-        if stats:
+        if stats.get('scrape_success'):
             logger.info("Scraping completed successfully")
             return True
         else:
             logger.error("Scraping failed")
             return False
     except Exception as e:
-        logger.error(f"Scraping error: {e}")
+        logger.error("Scraping error: %s", e)
         return False
 
 def download_data_with_config(
-    input_file: str = 'latest.json',
+    input_file: Union[str, List[Dict]] = 'latest.json',
     resume: bool = False,
     no_download: bool = False,
     all_versions: bool = False,
@@ -356,7 +469,8 @@ def download_data_with_config(
             logger.info("No download mode: skipping download")
             return True
             
-        logger.info(f"Starting download from {input_file} with configuration...")
+        source = f"{len(input_file)} selected files" if isinstance(input_file, list) else input_file
+        logger.info("Starting download from %s with configuration...", source)
         
         dest_dir = 'downloads/By-Series' if organize_by_series else 'downloads/By-Release'
         
@@ -377,9 +491,65 @@ def download_data_with_config(
             logger.error("Download failed")
             return False
     except Exception as e:
-        logger.error(f"Download error: {e}")
+        logger.error("Download error: %s", e)
         return False
 
+class DownloadProgressLog:
+    """
+    CLI progress callback for download_pdfs that logs aggregated progress.
+
+    Logging every file (and every chunk) would put one formatted, locked handler write per
+    event on the download path. Instead completions are only counted, and a single
+    "Overall progress" line with the throughput since the previous line is emitted at most
+    once per *interval* seconds. Failures and the final summary are still logged right away.
+
+    Args:
+        interval (float): Minimum seconds between progress lines (default: DOWNLOAD_LOG_INTERVAL or 15)
+    """
+
+    def __init__(self, interval: Optional[float] = None) -> None:
+        self.interval = float(os.getenv('DOWNLOAD_LOG_INTERVAL', '15')) if interval is None else interval
+        self._reset()
+
+    def _reset(self) -> None:
+        self.completed = 0
+        self._percent: Optional[float] = None
+        self._last_completed = 0
+        self._last_time = time.monotonic()
+
+    def _report(self, force: bool = False) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        if not force and elapsed < self.interval:
+            return
+        rate = (self.completed - self._last_completed) / max(elapsed, 1e-9)
+        if self._percent is None:
+            # Streamed downloads have no known total, so only the count is reported
+            logger.info("Downloaded %d files (%.1f files/s)", self.completed, rate)
+        else:
+            logger.info("Overall progress: %.1f%% (%d files done, %.1f files/s)", self._percent, self.completed, rate)
+        self._last_completed = self.completed
+        self._last_time = now
+
+    def __call__(self, identifier: str, status: str, value) -> None:
+        if status == "file_complete":
+            self.completed += 1
+            self._report()
+        elif status == "overall_progress":
+            self._percent = value
+            self._report(force=value >= 100)
+        elif status == "error":
+            logger.warning("✗ %s failed", identifier)
+        elif status == "errors":
+            logger.warning("%d file(s) failed to download", value)
+        elif status == "cancelled":
+            logger.info("Downloads cancelled")
+        elif status == "all_finished":
+            logger.info("All downloads finished (%d files)", self.completed)
+            self._reset()
+
+log_download_event = DownloadProgressLog()
+
 def main(args):
     """
     Main function to handle argument parsing and invoking the scraper and downloader
@@ -389,122 +559,156 @@ def main(args):
         -T/--threads: Number of threads for parallel downloads (default: 5, multi-threaded).
         -v/--verbose: Display verbose content for console (default: INFO).
         -r/--resume: Only use this switch to resume broken downloads and exit. New PDFs will not be downloaded.
-        -n/--nodownload: Only create links.json and exit without downloads.
+        -n/--nodownload: Only create links.jsonl and exit without downloads.
         -a/--all: Download all versions for the releases from Rel-15 to the latest available release (default: False).
         -h/--help: Show this help message and exit.
     Returns:
         None
     """
 
-    # make sure downloads directory exists
-    Path('downloads').mkdir(parents=True, exist_ok=True)
-    # make sure logs directory exists
-    Path('logs').mkdir(parents=True, exist_ok=True)
-
-    if args.verbose:
-        logger.setLevel(logging.DEBUG)
-    if args.nodownload:
-        logger.info("No download mode activated.")
-    # Add more logic here as needed to handle downloading based on args
-    logger.info(f"Arguments received: {args}")
+    # Cleanup runs when main() unwinds, including through the sys.exit() calls below and
+    # the SystemExit raised by the signal handler, rather than at interpreter shutdown.
+    with contextlib.ExitStack() as stack:
+        stack.callback(close_download_runtime)
+
+        # make sure downloads directory exists
+        Path('downloads').mkdir(parents=True, exist_ok=True)
+        # make sure logs directory exists
+        Path('logs').mkdir(parents=True, exist_ok=True)
+
+        if args.verbose:
+            logger.setLevel(logging.DEBUG)
+        if args.nodownload:
+            logger.info("No download mode activated.")
+        # Add more logic here as needed to handle downloading based on args
+        logger.info("Arguments received: %s", args)
     
-    # set up signal handlers for graceful shutdown
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-
-    if args.resume:
-        logger.info("Resume mode activated. Exiting after downloading previously scraped links.")
-        # In resume mode, skip scraping and just download from existing links.json or latest.json
-        if Path('downloads/links.json').exists() or Path('downloads/latest.json').exists():
-            if not args.all:
-                if Path('downloads/links.json').exists():
-                    if filter_latest_versions(input_file='downloads/links.json', output_file='downloads/latest.json'):
-                        logger.info("Resume mode - Filtered to latest versions successfully.")
+        # set up signal handlers for graceful shutdown
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
+
+        if args.resume:
+            logger.info("Resume mode activated. Exiting after downloading previously scraped links.")
+            # In resume mode, skip scraping and just download from existing links.jsonl or latest.json
+            links_path = _find_links_manifest()
+            if links_path or Path('downloads/latest.json').exists():
+                if not args.all:
+                    if links_path:
+                        latest = filter_latest_versions(input_file=str(links_path), output_file='downloads/latest.json')
+                        if latest:
+                            logger.info("Resume mode - Filtered to latest versions successfully.")
+                            if download_pdfs(
+                                input_file=latest, 
+                                dest_dir='downloads/By-Release' if not args.series else 'downloads/By-Series', 
+                                concurrency=args.threads, 
+                                callback=log_download_event
+                            ):
+                                logger.info("Resume mode - Download completed successfully.")
+                                # delete links and latest files
+                                _remove_manifests()
+                                sys.exit(0)
+                            else:
+                                logger.error("Resume mode - Download failed.")
+                                sys.exit(1)
+                        else:
+                            logger.error("Resume mode - Failed to filter to latest versions.")
+                            sys.exit(1)
+                    elif Path('downloads/latest.json').exists():
                         if download_pdfs(
                             input_file='downloads/latest.json', 
                             dest_dir='downloads/By-Release' if not args.series else 'downloads/By-Series', 
                             concurrency=args.threads, 
-                            callback=lambda fn, status, pct: logger.info(f"✓ {fn} {status} at {pct}%")
-                        ):
+                            callback=log_download_event
+                            ):
                             logger.info("Resume mode - Download completed successfully.")
                             # delete links and latest files
-                            Path('downloads/links.json').unlink(missing_ok=True)
-                            Path('downloads/latest.json').unlink(missing_ok=True)
+                            _remove_manifests()
                             sys.exit(0)
                         else:
                             logger.error("Resume mode - Download failed.")
+                            # Lets continue with scraping
+
+                else:
+                    logger.info("Resume mode - Downloading all versions as per --all flag; skipping filtering.")
+                    if not links_path:
+                        logger.error("links.jsonl does not exist for downloading all versions.")
+                        try:
+                            run_scraper(logging_lvl=logging.DEBUG if args.verbose else logging.INFO)
+                        except Exception as e:
+                            logger.error("Error running scraper: %s", e) 
                             sys.exit(1)
-                    else:
-                        logger.error("Resume mode - Failed to filter to latest versions.")
+                        links_path = _find_links_manifest()
+                    if not links_path:
+                        logger.error("links.jsonl does not exist after scraping.")
                         sys.exit(1)
-                elif Path('downloads/latest.json').exists():
-                    if download_pdfs(
-                        input_file='downloads/latest.json', 
+                    download_pdfs(
+                        input_file=str(links_path), 
                         dest_dir='downloads/By-Release' if not args.series else 'downloads/By-Series', 
                         concurrency=args.threads, 
-                        callback=lambda fn, status, pct: logger.info(f"✓ {fn} {status} at {pct}%")
-                        ):
-                        logger.info("Resume mode - Download completed successfully.")
-                        # delete links and latest files
-                        Path('downloads/links.json').unlink(missing_ok=True)
-                        Path('downloads/latest.json').unlink(missing_ok=True)
-                        sys.exit(0)
-                    else:
-                        logger.error("Resume mode - Download failed.")
-                        # Lets continue with scraping
-
-            else:
-                logger.info("Resume mode - Downloading all versions as per --all flag; skipping filtering.")
-                if not Path('downloads/links.json').exists():
-                    logger.error("links.json does not exist for downloading all versions.")
-                    try:
-                        run_scraper(logging_lvl=logging.DEBUG if args.verbose else logging.INFO)
-                    except Exception as e:
-                        logger.error(f"Error running scraper: {e}") 
-                        sys.exit(1)
-                if not Path('downloads/links.json').exists():
-                    logger.error("links.json does not exist after scraping.")
-                    sys.exit(1)
-                download_pdfs(
-                    input_file='downloads/links.json', 
-                    dest_dir='downloads/By-Release' if not args.series else 'downloads/By-Series', 
-                    concurrency=args.threads, 
-                    callback=lambda fn, status, pct: logger.info(f"✓ {fn} {status} at {pct}%")) 
-            logger.info("Exiting as per resume mode.")
-            sys.exit(0)
-
-    try:
-        run_scraper(logging_lvl=logging.DEBUG if args.verbose else logging.INFO)
-    except Exception as e:
-        logger.error(f"Error running scraper: {e}")
+                        callback=log_download_event) 
+                logger.info("Exiting as per resume mode.")
+                sys.exit(0)
+
+        dest_dir = 'downloads/By-Release' if not args.series else 'downloads/By-Series'
+        # Scraping, filtering and downloading all happen in the crawl process: with --all PDFs are
+        # downloaded while the crawl runs, otherwise the latest versions are once it ends
+        download_in_crawl = not args.nodownload and not args.resume
+        stats = {}
+        try:
+            stats = run_scraper(
+                logging_lvl=logging.DEBUG if args.verbose else logging.INFO,
+                download_dir=dest_dir if download_in_crawl else None,
+                download_concurrency=args.threads,
+                download_callback=log_download_event,
+                latest_output=None if args.all else 'downloads/latest.json',
+            )
+        except Exception as e:
+            logger.error("Error running scraper: %s", e)
     
-    # After scraping, filter to keep only the latest versions
-    if not args.all:
-        if filter_latest_versions(input_file='downloads/links.json', output_file='downloads/latest.json'):
-            logger.info("Filtered to latest versions successfully.")
+        # After scraping, filter to keep only the latest versions
+        latest = None
+        if not args.all:
+            if 'latest_version_count' in stats:
+                filtered = stats['latest_version_count']
+                if stats.get('latest_version_skipped'):
+                    logger.warning(
+                        "Skipped %s entries missing ts_number/version while filtering.", stats['latest_version_skipped']
+                    )
+            else:
+                # The crawl did not get as far as the filtering pipeline; fall back to links.jsonl
+                latest = filter_latest_versions(input_file='downloads/links.jsonl', output_file='downloads/latest.json')
+                filtered = len(latest or ())
+            if filtered:
+                logger.info("Filtered to latest versions successfully.")
+            else:
+                # Nothing was written to latest.json this run; any copy on disk is missing or stale
+                logger.error("Failed to filter to latest versions.")
+                sys.exit(1)
         else:
-            logger.error("Failed to filter to latest versions.")
-    else:
-        logger.info("Downloading all versions as per --all flag; skipping filtering.")
-
-    # After scraping, if nodownload is not set, proceed to download
-    # if we have resume set and here, then we have issues with links.json or latest.json and failed to download
-    # hopefully next run with resume will work since we have scraped fresh links.json
-    if not args.nodownload and not args.resume: 
-        logger.info("Starting download process...")
-        if download_pdfs(
-            input_file='downloads/latest.json' if not args.all else 'downloads/links.json', 
-            dest_dir='downloads/By-Release' if not args.series else 'downloads/By-Series', 
-            concurrency=args.threads, 
-            callback=lambda fn, status, pct: logger.info(f"✓ {fn} {status} at {pct}%")):
-            logger.info("Download process completed successfully.")
-            # delete links and latest files
-            Path('downloads/links.json').unlink(missing_ok=True)
-            Path('downloads/latest.json').unlink(missing_ok=True)
-            sys.exit(0)
-        else:            
-            logger.error("Download process encountered errors.")
-            sys.exit(1)
+            logger.info("Downloading all versions as per --all flag; skipping filtering.")
+
+        # After scraping, if nodownload is not set, proceed to download
+        # if we have resume set and here, then we have issues with links.jsonl or latest.json and failed to download
+        # hopefully next run with resume will work since we have scraped fresh links.jsonl
+        if not args.nodownload and not args.resume: 
+            if 'pdf_download_success' in stats:
+                downloaded = stats['pdf_download_success']
+            else:
+                logger.info("Starting download process...")
+                # The filtered records are handed over directly; latest.json only serves --resume
+                downloaded = download_pdfs(
+                    input_file=latest or ('downloads/latest.json' if not args.all else 'downloads/links.jsonl'), 
+                    dest_dir=dest_dir, 
+                    concurrency=args.threads, 
+                    callback=log_download_event)
+            if downloaded:
+                logger.info("Download process completed successfully.")
+                # delete links and latest files
+                _remove_manifests()
+                sys.exit(0)
+            else:            
+                logger.error("Download process encountered errors.")
+                sys.exit(1)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -517,7 +721,7 @@ if __name__ == "__main__":
     parser.add_argument("-T", "--threads", type=int, default=5, help="Number of threads for parallel downloads (default: 5, multi-threaded).")
     parser.add_argument("-v", "--verbose", action='store_true', help="Display verbose content for console (default: INFO).")
     parser.add_argument("-r", "--resume", action='store_true', help="Only use this switch to resume broken downloads and exit. New PDFs will not be downloaded.(default: False).")
-    parser.add_argument("-n", "--nodownload", action='store_true', help="Only create links.json and exit without downloads.(default: False).")
+    parser.add_argument("-n", "--nodownload", action='store_true', help="Only create links.jsonl and exit without downloads.(default: False).")
     parser.add_argument("-a", "--all", action='store_true', help="Download all versions for the releases from Rel-15 to the latest available release (default: False).")
     args = parser.parse_args()
 
@@ -1,4 +1,4 @@
-# Class for scrapy spider for recursively fetching the pdf links and saving them into the links.json file
+# Class for scrapy spider for recursively fetching the pdf links and saving them into the links.jsonl file
 import scrapy
 import re
 import logging
@@ -19,6 +19,16 @@ backup_count = int(os.getenv('ETSI_SPIDER_BACKUP_COUNT', '5'))
 
 logger = setup_logger(logger_name, log_file=logging_file, console_level=console_level, logfile_level=file_level, max_bytes=max_bytes, backup_count=backup_count)
 
+# Directory patterns matched against every href on every listing page; compiled once.
+_RANGE_DIR_RE = re.compile(r'/\d{6}_\d{6}/$')                     # e.g. .../123500_123599/
+_TS_DIR_RE = re.compile(r'(?:^|/)\d{6}/$')                         # e.g. .../123501/ (not the parent range)
+# e.g. .../18.10.00_60/ -> major, minor, editorial = 18, 10, 00
+_VERSION_DIR_RE = re.compile(r'(?:^|/)(?P<major>\d{1,2})\.(?P<minor>\d{1,2})\.(?P<editorial>\d{1,2})_\d{2}/$')
+
+# Let libxml2 drop non-matching anchors before any href string reaches Python.
+_DIR_HREFS_XPATH = '//a[substring(@href, string-length(@href))="/"]/@href'
+_PDF_HREFS_XPATH = '//a[substring(@href, string-length(@href) - 3)=".pdf"]/@href'
+
 class EtsiSpider(scrapy.Spider):
     name = 'etsi'
     start_urls = os.getenv('ETSI_START_URLS', 'https://www.etsi.org/deliver/etsi_ts/').split(',')
@@ -40,84 +50,70 @@ class EtsiSpider(scrapy.Spider):
 
     custom_settings = extension_settings
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Read once per crawl rather than for every TS page
+        focus_series = os.getenv('ETSI_FOCUS_SERIES', '21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39')
+        self.allowed_series = frozenset(int(s) for s in focus_series.split(',') if s.strip()) if focus_series else None
+        self.min_release = int(os.getenv('ETSI_MIN_RELEASE', '15'))
 
     def parse(self, response):
-        logger.debug(f'Parsing root: {response.url}')
-        # Adjusted regex to match the pattern after a specific path
-        pattern = r'/\d{6}_\d{6}/$'
-        for href in response.xpath('//a/@href').getall():
-            logger.debug(f'href: {href}')
-            if href.endswith('/') and re.search(pattern, href): #re.match(r'\d{6}_\d{6}/', href): #
-                logger.debug(f'Found range dir: {href}')
+        logger.debug('Parsing root: %s', response.url)
+        for href in response.xpath(_DIR_HREFS_XPATH).getall():
+            logger.debug('href: %s', href)
+            if _RANGE_DIR_RE.search(href):
+                logger.debug('Found range dir: %s', href)
                 yield response.follow(href, callback=self.parse_range)
             else:
                 continue
 
     def parse_range(self, response):
-        logger.debug(f'Parsing range from: {response.url}')
-        # Adjusted regex to match the pattern after a specific path
-        pattern = r'\d{6}/$'
-        for href in response.xpath('//a/@href').getall():
-            if href.endswith('/') and re.search(pattern, href): #re.match(r'\d{6}/', href):
-                logger.debug(f'Found TS dir: {href}')
+        logger.debug('Parsing range from: %s', response.url)
+        for href in response.xpath(_DIR_HREFS_XPATH).getall():
+            if _TS_DIR_RE.search(href):
+                logger.debug('Found TS dir: %s', href)
                 yield response.follow(href, callback=self.parse_ts)
 
     def parse_ts(self, response):
-        logger.debug(f'Parsing 3GPP TS from: {response.url}')
-        ts_dir = response.url.rstrip('/').split('/')[-1]  # e.g., '123501'
+        logger.debug('Parsing 3GPP TS from: %s', response.url)
+        ts_dir = response.url.rstrip('/').rpartition('/')[2]  # e.g., '123501'
         if len(ts_dir) != 6 or not ts_dir.isdigit():
             return
         series = ts_dir[1:3]
-        try:
-            series_int = int(series)
-            focus_series = os.getenv('ETSI_FOCUS_SERIES', '21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39')
-            if focus_series:
-                allowed_series = [int(s.strip()) for s in focus_series.split(',')]
-                if series_int not in allowed_series:
-                    return
-            else:
-                # If no focus series specified, allow all
-                pass
-        except ValueError:
-            logger.error(f'Invalid TS dir: {ts_dir}')
+        # No focus series configured means every series is allowed
+        if self.allowed_series is not None and int(series) not in self.allowed_series:
             return
         ts_number = f'{series}.{ts_dir[3:]}'  # e.g., '23.501'
-        logger.debug(f'Processing TS: {ts_number} (series: {series})')
-        # Adjusted regex to match the pattern after a specific path
-        pattern = r'\d{1,2}\.\d{1,2}\.\d{1,2}_\d{2}/$'
-        for href in response.xpath('//a/@href').getall():
-            if href.endswith('/') and re.search(pattern, href): #re.match(r'\d{1,2}\.\d{1,2}\.\d{1,2}_\d{2}/', href):
-                version_str = href[:-1]  # e.g., '18.10.00_60'
-                logger.debug(f'Version string: {version_str}')
-                if '_' in version_str:
-                    v_part = version_str.split('/')[5][0:8] #version_str.split('_')[0]  # '18.10.00'
-                    logger.debug(f'Version part: {v_part}')
-                    parts = v_part.split('.')
-                    if len(parts) == 3:
-                        major, minor, editorial = map(int, parts)
-                        min_release = int(os.getenv('ETSI_MIN_RELEASE', '15'))
-                        if major >= min_release:
-                            meta = {
-                                'series': series,
-                                'release': major,
-                                'version': f'{major}.{minor}.{editorial}',
-                                'ts_number': ts_number
-                            }
-                            logger.debug(f'Found version dir: {href} (release: {major})')
-                            yield response.follow(href, callback=self.parse_version, meta=meta)
+        logger.debug('Processing TS: %s (series: %s)', ts_number, series)
+        min_release = self.min_release
+        for href in response.xpath(_DIR_HREFS_XPATH).getall():
+            match = _VERSION_DIR_RE.search(href)
+            if not match:
+                continue
+            major = int(match['major'])
+            if major < min_release:
+                continue
+            minor, editorial = int(match['minor']), int(match['editorial'])
+            meta = {
+                'series': series,
+                'release': major,
+                'version': f'{major}.{minor}.{editorial}',
+                'ts_number': ts_number
+            }
+            logger.debug('Found version dir: %s (release: %s)', href, major)
+            yield response.follow(href, callback=self.parse_version, meta=meta)
 
     def parse_version(self, response):
         meta = response.meta
-        logger.debug(f'Parsing version from: {response.url}')
-        for href in response.xpath('//a/@href').getall():
-            if href.endswith('.pdf'):
-                pdf_url = response.urljoin(href)
-                logger.debug(f'Found PDF: {pdf_url}')
-                item = {
-                    'url': pdf_url,
-                    'series': meta['series'],
-                    'release': meta['release'],
-                    'ts_number': meta['ts_number'],
-                    'version': meta['version']
-                }
-                yield item
+        logger.debug('Parsing version from: %s', response.url)
+        for href in response.xpath(_PDF_HREFS_XPATH).getall():
+            pdf_url = response.urljoin(href)
+            logger.debug('Found PDF: %s', pdf_url)
+            item = {
+                'url': pdf_url,
+                'series': meta['series'],
+                'release': meta['release'],
+                'ts_number': meta['ts_number'],
+                'version': meta['version']
+            }
+            yield item
@@ -0,0 +1,20 @@
+# Scrapy feed exporters used by the scraper's FEEDS setting
+from scrapy.exporters import JsonLinesItemExporter
+
+try:  # optional fast JSON codec
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+class OrjsonLinesItemExporter(JsonLinesItemExporter):
+    """JSON Lines exporter that encodes each item with orjson when it is installed."""
+
+    def export_item(self, item):
+        if orjson is None:
+            return super().export_item(item)
+        itemdict = dict(self._get_serialized_fields(item))
+        self.file.write(orjson.dumps(itemdict, default=str) + b'\n')
+
+
+EXPORTER_PATH = "tools.exporters.OrjsonLinesItemExporter"
@@ -5,16 +5,18 @@ used by both the CLI and API layers and covered via unit tests.
 """
 from __future__ import annotations
 
-from collections import defaultdict
+import functools
 from typing import Iterable, List, Dict, Tuple, Any
 
 
+@functools.lru_cache(maxsize=4096)
 def _version_key(raw_version: str | int | float | None) -> Tuple[int, ...]:
     """Convert version strings like '18.10.00' into comparable tuples.
 
     Non-numeric segments fall back to their numeric prefix, defaulting to 0
     when no digits are present. This matches the legacy behaviour in
     ``src.main.filter_latest_versions`` while being testable in isolation.
+    Results are cached: a manifest repeats the same few thousand version strings.
     """
     if raw_version is None:
         return (0,)
@@ -61,6 +63,37 @@ def _normalise_release(value: Any) -> Tuple[bool, Any]:
     return (False, str(value))
 
 
+class LatestVersions:
+    """Incremental form of :func:`filter_latest_records`.
+
+    Records are fed one at a time with :meth:`add`, so the reduction can run
+    while they are produced (e.g. inside a Scrapy item pipeline) and only the
+    current best items per TS and release are kept.
+    """
+
+    def __init__(self) -> None:
+        self._best: Dict[Tuple[str, Tuple[bool, Any]], Tuple[Tuple[int, ...], List[Dict]]] = {}
+        self.skipped = 0
+
+    def add(self, entry: Dict) -> None:
+        ts_number = entry.get('ts_number') or entry.get('ts')
+        version = entry.get('version')
+        if not ts_number or not version:
+            self.skipped += 1
+            return
+        group = (str(ts_number), _normalise_release(entry.get('release')))
+        key = _version_key(version)
+        current = self._best.get(group)
+        if current is None or key > current[0]:
+            self._best[group] = (key, [entry])
+        elif key == current[0]:
+            current[1].append(entry)
+
+    def records(self) -> List[Dict]:
+        """Return the items that share the highest version of their group."""
+        return [item for _key, items in self._best.values() for item in items]
+
+
 def filter_latest_records(records: Iterable[Dict]) -> Tuple[List[Dict], int]:
     """Return all items corresponding to the latest version per TS *and release*.
 
@@ -69,31 +102,11 @@ def filter_latest_records(records: Iterable[Dict]) -> Tuple[List[Dict], int]:
     they share the highest version key, avoiding the data loss that
     triggered recent download gaps.
     """
-    grouped: defaultdict[Tuple[str, Tuple[bool, Any]], List[Dict]] = defaultdict(list)
-    skipped = 0
+    latest = LatestVersions()
+    add = latest.add
     for entry in records:
-        ts_number = entry.get('ts_number') or entry.get('ts')
-        version = entry.get('version')
-        if not ts_number or not version:
-            skipped += 1
-            continue
-        release_key = _normalise_release(entry.get('release'))
-        grouped[(str(ts_number), release_key)].append(entry)
-
-    filtered: List[Dict] = []
-    for (_ts_number, _release_key), items in grouped.items():
-        max_key: Tuple[int, ...] | None = None
-        for item in items:
-            key = _version_key(item.get('version'))
-            if max_key is None or key > max_key:
-                max_key = key
-        if max_key is None:
-            continue
-        for item in items:
-            if _version_key(item.get('version')) == max_key:
-                filtered.append(item)
-
-    return filtered, skipped
+        add(entry)
+    return latest.records(), latest.skipped
 
 
-__all__ = ["filter_latest_records", "_version_key"]
+__all__ = ["LatestVersions", "filter_latest_records", "_version_key"]
@@ -2,10 +2,11 @@
 json_downloader.py
 
 A small, fully‑async helper that:
-    * loads an array of JSON objects (each containing at least the keys url, series, release).
+    * loads a JSON array or JSON Lines manifest of objects (each containing at least the keys url, series, release).
     * downloads every file concurrently.
     * writes each file into a nested tree: <root>/rel-<release>/series-<series>/<basename>.
-    * uses HTTP HEAD to check remote size before downloading, so that already‑existing identical files are skipped.
+    * probes the remote size with a single ranged GET (no separate HEAD), so that already‑existing identical files are skipped
+      and small files are streamed from that same response.
     * creates missing parent directories automatically.
     * optionally reports progress via tqdm.asyncio and allows a callback after each download.
 
@@ -14,19 +15,25 @@ Author: KK (2025‑09‑25)
 
 # ────── Imports ──────
 import asyncio
+import atexit
 import contextlib
 import logging
 import os
 from pathlib import Path
-import json
 import threading
 
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 import aiohttp          # HTTP client
-import aiofiles         # async file I/O
+try:  # optional HTTP/2 transport for ranged chunk downloads
+    import httpx
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    httpx = None  # type: ignore
 from tqdm.asyncio import tqdm_asyncio   # progress bar that works inside an event loop
+from tools.manifest import dumps, loads, read_records
+from tools.throttle import get_throttle
 from utils.logging_config import setup_logger
 #configure logger
 logging_file = os.getenv('JSON_DOWNLOADER_LOG_FILE', 'logs/json_downloader.log')
@@ -38,22 +45,50 @@ backup_count = int(os.getenv('JSON_DOWNLOADER_BACKUP_COUNT', '5'))
 
 logger = setup_logger(logger_name, log_file=logging_file, console_level=console_level, logfile_level=file_level, max_bytes=max_bytes, backup_count=backup_count)
 
-__all__ = ["download_from_json"]
+__all__ = ["download_from_json", "download_items", "get_download_session"]
 
-def _build_connector() -> aiohttp.TCPConnector:
+def _small_file_concurrency(concurrency: int) -> int:
+    """How many files may be probed/streamed at once; large multipart files are still capped at *concurrency*.
+
+    Most specs are small enough that per-request latency, not bandwidth, dominates, so the
+    outer limit is wider than the multipart one unless ``DOWNLOAD_SMALL_FILE_CONCURRENCY`` says otherwise.
+    """
+    configured = os.getenv('DOWNLOAD_SMALL_FILE_CONCURRENCY')
+    if configured:
+        return max(int(configured), concurrency)
+    return max(concurrency * 4, 16)
+
+def _per_host_limit(concurrency: int, small_concurrency: int = 0) -> int:
+    """Size the per-host connection budget for *concurrency* files, each fanning out into range chunks.
+
+    An explicit ``HTTP_MAX_CONNECTIONS_PER_HOST`` always wins; otherwise the budget covers the
+    worst case of every concurrent large file using the largest chunk count plus one connection
+    per concurrent small file, so range requests queue for a pooled connection instead of
+    churning through new TCP/TLS handshakes.
+    """
+    configured = os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST')
+    if configured:
+        return int(configured)
+    max_chunks = max(int(os.getenv(f'DOWNLOAD_CHUNK_COUNT_{i}', default)) for i, default in
+                     ((1, '4'), (2, '6'), (3, '8'), (4, '10'), (5, '10')))
+    return max(concurrency * max_chunks + small_concurrency, 16)
+
+def _build_connector(limit_per_host: Optional[int] = None) -> aiohttp.TCPConnector:
     """Create a fresh connector. Each session owns its connector to avoid cross-loop reuse."""
+    if limit_per_host is None:
+        limit_per_host = int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', '10'))
     return aiohttp.TCPConnector(
         limit=int(os.getenv('HTTP_MAX_CONNECTIONS', '100')),
-        limit_per_host=int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', '10')),
+        limit_per_host=limit_per_host,
         ttl_dns_cache=int(os.getenv('HTTP_DNS_CACHE_TTL', '300')),
         use_dns_cache=os.getenv('HTTP_USE_DNS_CACHE', 'true').lower() == 'true',
         keepalive_timeout=int(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '60')),
         enable_cleanup_closed=os.getenv('HTTP_ENABLE_CLEANUP_CLOSED', 'true').lower() == 'true',
     )
 
-def get_session():
+def get_session(limit_per_host: Optional[int] = None):
     return aiohttp.ClientSession(
-        connector=_build_connector(),
+        connector=_build_connector(limit_per_host),
         connector_owner=True,
         timeout=aiohttp.ClientTimeout(
             total=float(os.getenv('HTTP_TOTAL_TIMEOUT', '300')),
@@ -62,6 +97,29 @@ def get_session():
         )
     )
 
+def get_download_session(concurrency: int) -> aiohttp.ClientSession:
+    """Create a session sized for :func:`download_from_json` with the same *concurrency*.
+
+    Callers that download repeatedly can keep the session and pass it back in, so pooled
+    keep-alive connections (and their TLS handshakes) are reused across calls.
+    """
+    return get_session(limit_per_host=_per_host_limit(concurrency, _small_file_concurrency(concurrency)))
+
+def http2_enabled() -> bool:
+    """True when ranged chunks should be multiplexed over HTTP/2 (opt-in via HTTP_ENABLE_HTTP2)."""
+    return httpx is not None and os.getenv('HTTP_ENABLE_HTTP2', 'false').lower() == 'true'
+
+def get_http2_client(max_connections: int):
+    """Create an HTTP/2 client; all range streams to a host share one multiplexed connection."""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=httpx.Timeout(
+            float(os.getenv('HTTP_READ_TIMEOUT', '60')),
+            connect=float(os.getenv('HTTP_CONNECT_TIMEOUT', '10')),
+        ),
+    )
+
 async def cleanup():
     """Backwards compatibility shim; retained for callers expecting the coroutine."""
     return
@@ -69,8 +127,29 @@ async def cleanup():
 # ------------------------------------------------------------------
 #  Retry utilities
 # ------------------------------------------------------------------
+_RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (aiohttp.ClientError, asyncio.TimeoutError)
+if httpx is not None:
+    _RETRYABLE_ERRORS += (httpx.HTTPError,)
+
+class _Throttled(aiohttp.ClientError):
+    """Raised on HTTP 429; the shared host throttle, not the retry loop, decides the wait."""
+
+
+async def _throttle_slot(url: str) -> None:
+    """Wait until the per-host throttle lets another request to *url* start."""
+    wait = get_throttle().reserve(url)
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+def _record_status(url: str, status: int, headers) -> None:
+    """Report a response to the host throttle; 429s become retryable :class:`_Throttled` errors."""
+    get_throttle().record(url, status, headers.get('Retry-After'))
+    if status == 429:
+        raise _Throttled(f"{url} throttled (429)")
+
 async def retry_with_backoff(func, *args, max_retries=None, base_delay=None, max_delay=None, **kwargs):
-    """Retry a function with exponential backoff"""
+    """Retry a function with exponential backoff (429s wait on the host throttle instead)"""
     if max_retries is None:
         max_retries = int(os.getenv('RETRY_MAX_ATTEMPTS', '5'))
     if base_delay is None:
@@ -82,10 +161,14 @@ async def retry_with_backoff(func, *args, max_retries=None, base_delay=None, max
     for attempt in range(max_retries + 1):
         try:
             return await func(*args, **kwargs)
-        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        except _Throttled as e:
+            if attempt == max_retries:
+                raise e
+            logger.warning("Attempt %d throttled: %s. Waiting for host slot...", attempt + 1, e)
+        except _RETRYABLE_ERRORS as e:
             if attempt == max_retries:
                 raise e
-            logger.warning(f"Attempt {attempt + 1} failed: {e}. Retrying in {delay:.1f}s...")
+            logger.warning("Attempt %d failed: %s. Retrying in %.1fs...", attempt + 1, e, delay)
             await asyncio.sleep(delay)
             delay = min(delay * 2, max_delay)
         except Exception as e:
@@ -93,42 +176,164 @@ async def retry_with_backoff(func, *args, max_retries=None, base_delay=None, max
             raise e
 
 # ------------------------------------------------------------------
-#  _download_chunk()
+#  Streaming write helpers
 # ------------------------------------------------------------------
-async def _download_chunk(url, start, end, session):
-    logger.debug(f"[download_chunk] Downloading bytes {start}-{end} from {url}")
+STREAM_BLOCK_SIZE = int(os.getenv('DOWNLOAD_STREAM_BLOCK_SIZE_KB', '64')) * 1024
+# Network blocks are coalesced up to this size so each executor hop and syscall moves ~1 MB.
+WRITE_BUFFER_SIZE = int(os.getenv('DOWNLOAD_WRITE_BUFFER_KB', '1024')) * 1024
+
+_SEEK_WRITE_LOCK = threading.Lock()
+
+# One process-wide pool for disk writes, shared by every file, chunk and event loop,
+# instead of each loop spinning up (and tearing down) its own default executor.
+_WRITE_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_WRITE_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_write_executor() -> ThreadPoolExecutor:
+    """Return the shared write executor, creating it on first use."""
+    global _WRITE_EXECUTOR
+    if _WRITE_EXECUTOR is None:
+        with _WRITE_EXECUTOR_LOCK:
+            if _WRITE_EXECUTOR is None:
+                _WRITE_EXECUTOR = ThreadPoolExecutor(
+                    max_workers=int(os.getenv('DOWNLOAD_WRITE_WORKERS', '8')),
+                    thread_name_prefix='download-write',
+                )
+                atexit.register(_WRITE_EXECUTOR.shutdown, wait=True)
+    return _WRITE_EXECUTOR
+
+
+# Output directories already created this process; there are only a few hundred
+# (release, series) folders for thousands of files, so skip the repeated mkdir/stat chain.
+_CREATED_DIRS: set[Path] = set()
+_CREATED_DIRS_LOCK = threading.Lock()
+
+
+def _ensure_dir(path: Path) -> None:
+    """Create *path* (and parents) once per process."""
+    if path in _CREATED_DIRS:
+        return
+    with _CREATED_DIRS_LOCK:
+        if path not in _CREATED_DIRS:
+            path.mkdir(parents=True, exist_ok=True)
+            _CREATED_DIRS.add(path)
+
+
+def _open_for_write(dest_path: Path, size: Optional[int] = None) -> int:
+    """Open *dest_path* for positional writes, truncating (and preallocating to *size*) first."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    try:
+        fd = os.open(dest_path, flags, 0o644)
+    except FileNotFoundError:
+        # The folder was removed behind our back (e.g. a long-running server); forget it and recreate.
+        with _CREATED_DIRS_LOCK:
+            _CREATED_DIRS.discard(dest_path.parent)
+        _ensure_dir(dest_path.parent)
+        fd = os.open(dest_path, flags, 0o644)
+    if size:
+        try:
+            os.ftruncate(fd, size)
+        except OSError:
+            os.close(fd)
+            raise
+    return fd
+
+
+def _write_at(fd: int, data: bytes, offset: int) -> None:
+    """Write *data* at *offset* without disturbing concurrent writers on the same descriptor."""
+    if hasattr(os, 'pwrite'):
+        view = memoryview(data)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            view = view[written:]
+            offset += written
+        return
+    # Platforms without pwrite (Windows) share the file offset, so serialise seek+write.
+    with _SEEK_WRITE_LOCK:
+        os.lseek(fd, offset, os.SEEK_SET)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+
+
+def _write_blocks_at(fd: int, blocks: list[bytes], offset: int) -> None:
+    """Join buffered *blocks* off the event loop and write them at *offset* in one call."""
+    _write_at(fd, blocks[0] if len(blocks) == 1 else b''.join(blocks), offset)
+
+
+async def _write_off_loop(executor: ThreadPoolExecutor, fd: int, blocks: list[bytes], offset: int) -> None:
+    """Run :func:`_write_blocks_at` in *executor*; on cancellation, wait for the write before unwinding.
+
+    A cancelled await does not stop the worker thread, so returning early would let the
+    caller close *fd* while the write is still in flight.
+    """
+    future = asyncio.get_running_loop().run_in_executor(executor, _write_blocks_at, fd, blocks, offset)
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait([future])
+        raise
+
+
+async def _stream_to_fd(blocks: AsyncIterator[bytes], fd: int, offset: int = 0) -> int:
+    """Write a response body iterator into *fd* starting at *offset*; return the number of bytes written."""
+    executor = _get_write_executor()
+    written = 0
+    pending: list[bytes] = []
+    pending_size = 0
+    async for block in blocks:
+        pending.append(block)
+        pending_size += len(block)
+        if pending_size >= WRITE_BUFFER_SIZE:
+            await _write_off_loop(executor, fd, pending, offset + written)
+            written += pending_size
+            pending = []
+            pending_size = 0
+    if pending:
+        await _write_off_loop(executor, fd, pending, offset + written)
+        written += pending_size
+    return written
+
+# ------------------------------------------------------------------
+#  _download_and_write_chunk()
+# ------------------------------------------------------------------
+async def _download_and_write_chunk(url, start, end, session, fd):
+    """Stream a byte range straight into its slot of the preallocated output file."""
+    logger.debug("[download_and_write_chunk] Downloading and writing bytes %s-%s from %s", start, end, url)
     headers = {'Range': f'bytes={start}-{end}'}
     
     async def chunk_request():
+        await _throttle_slot(url)
         async with session.get(url, headers=headers) as resp:
+            _record_status(url, resp.status, resp.headers)
             if resp.status != 206:  # Partial Content
                 raise aiohttp.ClientError(f"Range request failed: {resp.status}")
-            return await resp.read()
+            return await _stream_to_fd(resp.content.iter_chunked(STREAM_BLOCK_SIZE), fd, start)
     
     return await retry_with_backoff(chunk_request)
 
-async def _download_and_write_chunk(url, start, end, session, file_handle):
-    """Download a chunk and write it directly to the file at the correct position."""
-    logger.debug(f"[download_and_write_chunk] Downloading and writing bytes {start}-{end} from {url}")
+async def _download_and_write_chunk_h2(url, start, end, client, fd):
+    """HTTP/2 variant of :func:`_download_and_write_chunk`; the range travels as one stream on a shared connection."""
+    logger.debug("[download_and_write_chunk_h2] Downloading and writing bytes %s-%s from %s", start, end, url)
     headers = {'Range': f'bytes={start}-{end}'}
-    
+
     async def chunk_request():
-        async with session.get(url, headers=headers) as resp:
-            if resp.status != 206:  # Partial Content
-                raise aiohttp.ClientError(f"Range request failed: {resp.status}")
-            chunk_data = await resp.read()
-            # Seek to the correct position and write
-            await file_handle.seek(start)
-            await file_handle.write(chunk_data)
-            return len(chunk_data)
-    
+        await _throttle_slot(url)
+        async with client.stream("GET", url, headers=headers) as resp:
+            _record_status(url, resp.status_code, resp.headers)
+            if resp.status_code != 206:  # Partial Content
+                raise aiohttp.ClientError(f"Range request failed: {resp.status_code}")
+            return await _stream_to_fd(resp.aiter_bytes(STREAM_BLOCK_SIZE), fd, start)
+
     return await retry_with_backoff(chunk_request)
 
 # ------------------------------------------------------------------
 #  _multipart_download()
 # ------------------------------------------------------------------
-async def _multipart_download(url, dest_path, remote_size, num_chunks=4, session=None, progress_callback=None):
-    logger.info(f"[multipart_download] Using multi-part download for {dest_path} with {num_chunks} chunks")
+async def _multipart_download(url, dest_path, remote_size, num_chunks=4, session=None, progress_callback=None, h2_client=None):
+    logger.debug("[multipart_download] Using multi-part download for %s with %s chunks%s",
+                 dest_path, num_chunks, ' over HTTP/2' if h2_client is not None else '')
     if session is None:
         session = get_session()
         close_session = True
@@ -141,31 +346,117 @@ async def _multipart_download(url, dest_path, remote_size, num_chunks=4, session
         ranges = [(i * chunk_size, (i + 1) * chunk_size - 1 if i < num_chunks - 1 else remote_size - 1)
                   for i in range(num_chunks)]
 
-        # Open file for writing
-        async with aiofiles.open(dest_path, 'wb') as f:
-            # Download and write chunks concurrently
-            tasks = []
+        # Preallocate a .part file once; every range writes into its own region. It only
+        # replaces dest_path when every range arrived, so a failed or cancelled download
+        # never leaves a full-size file with zeroed holes that a later size check accepts.
+        part_path = dest_path.with_name(dest_path.name + '.part')
+        fd = _open_for_write(part_path, remote_size)
+        try:
             downloaded = 0
             lock = asyncio.Lock()  # To synchronize progress updates
             
             async def download_and_write_with_progress(start, end):
                 nonlocal downloaded
-                chunk_size = await _download_and_write_chunk(url, start, end, session, f)
+                if h2_client is not None:
+                    chunk_size = await _download_and_write_chunk_h2(url, start, end, h2_client, fd)
+                else:
+                    chunk_size = await _download_and_write_chunk(url, start, end, session, fd)
                 async with lock:
                     downloaded += chunk_size
                     if progress_callback:
                         progress_callback(downloaded / remote_size * 100)
             
-            for start, end in ranges:
-                task = asyncio.create_task(download_and_write_with_progress(start, end))
-                tasks.append(task)
+            tasks = [asyncio.create_task(download_and_write_with_progress(start, end)) for start, end in ranges]
             
             # Wait for all chunks to complete
-            await asyncio.gather(*tasks)
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # Stop the other ranges and let them unwind before the descriptor is closed
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        except BaseException:
+            os.close(fd)
+            part_path.unlink(missing_ok=True)
+            raise
+        os.close(fd)
+        os.replace(part_path, dest_path)
     finally:
         if close_session:
             await session.close()
 
+# ------------------------------------------------------------------
+#  _DownloadCache
+# ------------------------------------------------------------------
+class _DownloadCache:
+    """Persistent ``url -> {size, etag, last_modified}`` index of completed downloads.
+
+    PDFs on the ETSI server are immutable per URL (the version is part of the path), so a
+    local file whose size matches its entry is skipped without any network round trip on
+    repeat runs. Only responses that carried an ETag are recorded.
+    """
+
+    FILENAME = '.download-cache.json'
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        try:
+            self.entries = loads(path.read_bytes())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as exc:
+            logger.warning("[download_cache] Ignoring unreadable cache %s: %s", path, exc)
+
+    def is_complete(self, url: str, dest_path: Path) -> bool:
+        entry = self.entries.get(url)
+        if not entry:
+            return False
+        try:
+            return dest_path.stat().st_size == entry.get('size')
+        except OSError:
+            return False
+
+    def record(self, url: str, size: int, etag: Optional[str], last_modified: Optional[str]) -> None:
+        if not etag:
+            # Without a validator the server cannot vouch for the file; verify it again next run
+            if self.entries.pop(url, None) is not None:
+                self._dirty = True
+            return
+        entry = {'size': size, 'etag': etag, 'last_modified': last_modified}
+        if self.entries.get(url) != entry:
+            self.entries[url] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            tmp_path.write_bytes(dumps(self.entries))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as exc:
+            logger.warning("[download_cache] Unable to persist %s: %s", self.path, exc)
+
+# ------------------------------------------------------------------
+#  _probe_size()
+# ------------------------------------------------------------------
+def _probe_size(resp: aiohttp.ClientResponse) -> tuple[int, bool]:
+    """Return ``(remote_size, supports_ranges)`` for a ``Range: bytes=0-`` GET response."""
+    if resp.status == 206:
+        # Content-Range: bytes 0-1234/1235
+        total = resp.headers.get('Content-Range', '').rpartition('/')[2]
+        if total.isdigit():
+            return int(total), True
+        return int(resp.headers.get('Content-Length', 0)), False
+    supports_ranges = resp.headers.get('Accept-Ranges', '').lower() == 'bytes'
+    return int(resp.headers.get('Content-Length', 0)), supports_ranges
+
 # ------------------------------------------------------------------
 #  _fetch_and_write()
 # ------------------------------------------------------------------
@@ -176,15 +467,20 @@ async def _fetch_and_write(
         num_chunks: int = 10,
         session=None,
         progress_callback=None,
-) -> None:
+        h2_client=None,
+        cache: Optional[_DownloadCache] = None,
+        multipart_slots: Optional[asyncio.Semaphore] = None,
+) -> bool:
     """
     Download *url* and store it at *dest_path*.  
     The function will:
 
-      1. Send a HEAD request to get the remote size.
-      2. If the file does not exist or its size differs from the remote one,
-         perform a GET, otherwise skip.
-      3. Create missing parent directories automatically.
+      1. Create missing parent directories automatically.
+      2. Send a single ``GET`` with ``Range: bytes=0-``; the response headers
+         carry the remote size (``Content-Range`` on 206, ``Content-Length`` on 200).
+      3. Skip when the local file already has that size, otherwise stream the
+         body straight to disk – or, for large files that accept ranges, close
+         the probe and fetch the file as parallel chunks.
 
     Parameters
     ----------
@@ -196,11 +492,22 @@ async def _fetch_and_write(
         Number of chunks to download the file in (for large files).
     session : aiohttp.ClientSession, optional
         Session to use for requests.
+    h2_client : httpx.AsyncClient, optional
+        HTTP/2 client used for the ranged chunks of large files, when enabled.
+    cache : _DownloadCache, optional
+        Completed-download index; a cache hit skips the file without any request.
+    multipart_slots : asyncio.Semaphore, optional
+        Limits how many large files fan out into ranged chunks at once.
 
     Returns
     -------
-    None – all side‑effects happen inside this coroutine.
+    bool
+        True when the file is on disk (downloaded or already complete), False on failure.
     """
+    if cache is not None and cache.is_complete(url, dest_path):
+        logger.debug("[fetch_and_write] Skipping %s (cached ETag and size match)", dest_path)
+        return True
+
     if session is None:
         session = get_session()
         close_session = True
@@ -208,34 +515,71 @@ async def _fetch_and_write(
         close_session = False
     
     try:
-        logger.info(f"[fetch_and_write] HEAD request for {url} on {threading.current_thread().name}")
-        # 1️⃣  Ask for the remote size (HEAD) with retry
-        async def head_request():
-            async with session.head(url) as head_resp:
-                if head_resp.status != 200:
-                    raise aiohttp.ClientError(f"HEAD {url} returned {head_resp.status}")
-                return head_resp
-        
-        head_resp = await retry_with_backoff(head_request)
-        logger.info(f"[fetch_and_write] HEAD response {url} size={head_resp.headers.get('Content-Length')} status={head_resp.status}")
-        remote_size = int(head_resp.headers.get('Content-Length', 0))
-        supports_ranges = head_resp.headers.get('Accept-Ranges', '').lower() == 'bytes'
-        # 2️⃣  Make sure the parent folder exists (creates any missing part)
-        dest_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # 3️⃣  Skip or overwrite depending on local size
-        if dest_path.exists():
-            local_size = dest_path.stat().st_size
-            if local_size == remote_size:
-                logger.info(f"[fetch_and_write] Skipping {dest_path} (size matches)")
-                return True
-
-        logger.debug(f"[fetch_and_write] Downloading {url} to {dest_path} (remote size: {remote_size} bytes)")
-        # 4️⃣  Perform the download: use multipart if supported and file is large enough
+        logger.debug("[fetch_and_write] GET probe for %s", url)
+        # 1️⃣  Make sure the parent folder exists (creates any missing part)
+        _ensure_dir(dest_path.parent)
         multipart_min_size = int(os.getenv('DOWNLOAD_MULTIPART_MIN_SIZE_MB', '1')) * 1024 * 1024
-        if supports_ranges and remote_size > multipart_min_size:
+
+        # 2️⃣  One ranged GET both reports the size and, for small files, carries the body.
+        #     When a local copy already exists, ask for a single byte first: most of the
+        #     time it is complete and only the size in Content-Range is needed.
+        try:
+            local_size = dest_path.stat().st_size
+        except OSError:
+            local_size = None
+
+        async def probe_request(byte_range):
+            await _throttle_slot(url)
+            async with session.get(url, headers={'Range': byte_range}) as resp:
+                _record_status(url, resp.status, resp.headers)
+                if resp.status not in (200, 206):
+                    raise aiohttp.ClientError(f"GET {url} returned {resp.status}")
+                remote_size, supports_ranges = _probe_size(resp)
+                validators = (resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+                logger.debug("[fetch_and_write] GET probe response %s size=%s status=%s", url, remote_size, resp.status)
+
+                # Skip or overwrite depending on local size
+                if local_size == remote_size:
+                    return remote_size, validators, "skipped"
+                if resp.status == 206 and byte_range != 'bytes=0-':
+                    # Only the verification byte arrived; fetch the body with a full probe
+                    return remote_size, validators, "mismatch"
+                if supports_ranges and remote_size > multipart_min_size:
+                    return remote_size, validators, "multipart"
+
+                logger.debug("[fetch_and_write] Streaming %s to %s (remote size: %s bytes)", url, dest_path, remote_size)
+                # Like multipart downloads, stream into a .part file and only rename a complete body
+                part_path = dest_path.with_name(dest_path.name + '.part')
+                fd = _open_for_write(part_path)
+                try:
+                    try:
+                        written = await _stream_to_fd(resp.content.iter_chunked(STREAM_BLOCK_SIZE), fd)
+                    finally:
+                        os.close(fd)
+                    # Sizes only compare when aiohttp did not decode a Content-Encoding
+                    if remote_size and written != remote_size and 'Content-Encoding' not in resp.headers:
+                        raise aiohttp.ClientError(f"GET {url} ended after {written} of {remote_size} bytes")
+                    os.replace(part_path, dest_path)
+                except BaseException:
+                    part_path.unlink(missing_ok=True)
+                    raise
+                return remote_size, validators, "streamed"
+
+        remote_size, validators, outcome = await retry_with_backoff(
+            probe_request, 'bytes=0-0' if local_size else 'bytes=0-'
+        )
+        if outcome == "mismatch":
+            remote_size, validators, outcome = await retry_with_backoff(probe_request, 'bytes=0-')
+        if outcome == "skipped":
+            logger.debug("[fetch_and_write] Skipping %s (size matches)", dest_path)
+            if cache is not None:
+                cache.record(url, remote_size, *validators)
+            return True
+
+        # 3️⃣  Large files that accept ranges are fetched as parallel chunks
+        if outcome == "multipart":
+            logger.debug("[fetch_and_write] Downloading %s to %s (remote size: %s bytes)", url, dest_path, remote_size)
             # Calculate optimal number of chunks based on file size and connection speed
-            # Note: aiohttp connector limits concurrent requests per host to 10
             threshold_1 = int(os.getenv('DOWNLOAD_CHUNK_THRESHOLD_1_MB', '5')) * 1024 * 1024
             threshold_2 = int(os.getenv('DOWNLOAD_CHUNK_THRESHOLD_2_MB', '10')) * 1024 * 1024
             threshold_3 = int(os.getenv('DOWNLOAD_CHUNK_THRESHOLD_3_MB', '20')) * 1024 * 1024
@@ -253,28 +597,20 @@ async def _fetch_and_write(
             else:
                 optimal_chunks = int(os.getenv('DOWNLOAD_CHUNK_COUNT_1', '4'))
 
-            await _multipart_download(url, dest_path, remote_size, optimal_chunks, session, progress_callback)
-        else:
-            # Fallback to single GET with retry
-            async def get_request():
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        raise aiohttp.ClientError(f"GET {url} returned {resp.status}")
-                    return await resp.read()
-            
-            data = await retry_with_backoff(get_request)
-            async with aiofiles.open(dest_path, "wb") as f:
-                await f.write(data)
-        logger.info(f"[fetch_and_write] Downloaded {dest_path} ({remote_size} bytes)")
+            async with multipart_slots if multipart_slots is not None else contextlib.nullcontext():
+                await _multipart_download(url, dest_path, remote_size, optimal_chunks, session, progress_callback, h2_client)
+        logger.debug("[fetch_and_write] Downloaded %s (%s bytes)", dest_path, remote_size)
+        if cache is not None:
+            cache.record(url, remote_size, *validators)
         return True
     except aiohttp.ClientError as e:
-        logger.error(f"aiohttp error for {url}: {e}")
+        logger.error("aiohttp error for %s: %s", url, e)
         return False
     except RuntimeError as e:
-        logger.error(f"Runtime error (e.g., session closed) for {url}: {e}")
+        logger.error("Runtime error (e.g., session closed) for %s: %s", url, e)
         return False
     except Exception as e:
-        logger.error(f"Unexpected error for {url}: {e}")
+        logger.error("Unexpected error for %s: %s", url, e)
         return False
     finally:
         if close_session:
@@ -286,34 +622,43 @@ async def _fetch_and_write(
 #  _download_all()
 # ------------------------------------------------------------------
 async def _download_all(
-    items: list[dict],
+    items: list[dict] | AsyncIterator[dict],
     base_dir: Path,
     concurrency: int = 4,
     callback=None,
     cancel_event: Optional[threading.Event] = None,
+    show_progress: bool = True,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> None:
     """
     Kick off all downloads concurrently, but update a tqdm bar after each file finishes.
-    The *concurrency* argument limits how many coroutines run in parallel (uses an asyncio.Semaphore internally).
+    The *concurrency* argument limits how many large files download as parallel range chunks at once;
+    small files, which are bound by request latency rather than bandwidth, run with a wider limit.
     If *callback* is provided it will be called with the filename and the current percent‑value.
 
     Parameters
     ----------
-    items : list[dict]
-        List of JSON objects that contain at least the keys url, series and release.
+    items : list[dict] | AsyncIterator[dict]
+        JSON objects that contain at least the keys url, series and release. An async
+        iterator starts each download as soon as its item arrives (total unknown up front).
     base_dir : Path
         Root directory under which the nested tree will be created.
     concurrency : int, default 4
-        How many downloads run at once.
+        How many multipart (large-file) downloads run at once.
     callback : callable | None
         Optional function that will be called after each file finishes.  
         It receives two arguments: (filename, percent_of_100).
+    show_progress : bool, default True
+        Draw the aggregate progress bar (only when stderr is a terminal).
+    session : aiohttp.ClientSession, optional
+        Session to download with; it is left open. A new one is created and closed otherwise.
 
     Returns
     -------
     None – side‑effects happen inside this coroutine.
     """
-    total_items = len(items)
+    streaming = hasattr(items, '__aiter__')
+    total_items = None if streaming else len(items)
     if total_items == 0:
         return True
 
@@ -324,12 +669,44 @@ async def _download_all(
     if cancel_event and cancel_event.is_set():
         raise asyncio.CancelledError()
 
-    session = get_session()
+    small_concurrency = _small_file_concurrency(concurrency)
+    per_host_limit = _per_host_limit(concurrency, small_concurrency)
+    if session is None:
+        session = get_session(limit_per_host=per_host_limit)
+        close_session = True
+    else:
+        close_session = False
+    h2_client = get_http2_client(per_host_limit) if http2_enabled() else None
+    cache = _DownloadCache(base_dir / _DownloadCache.FILENAME)
     try:
-        sem = asyncio.Semaphore(concurrency)
+        sem = asyncio.Semaphore(small_concurrency)
+        large_sem = asyncio.Semaphore(concurrency)
         lock = asyncio.Lock()
         pbar = None
 
+        def dest_for(item) -> Path:
+            return (
+                base_dir
+                / f"rel-{item.get('release', '0')}"
+                / f"series-{item.get('series', '0')}"
+                / Path(item["url"]).name
+            )
+
+        # Local-only pre-pass (off the event loop, it is one stat per file): files the cache
+        # already vouches for never reach the network.
+        def partition_cached():
+            done, todo = [], []
+            for item in items:
+                (done if cache.is_complete(item["url"], dest_for(item)) else todo).append(item)
+            return done, todo
+
+        if streaming:
+            cached, pending = [], items
+        else:
+            cached, pending = await asyncio.to_thread(partition_cached)
+        if cached:
+            logger.info("[download_all] %d of %d files already complete per download cache", len(cached), total_items)
+
         async def download_item(item):
             nonlocal completed, processed, errors
 
@@ -337,18 +714,10 @@ async def _download_all(
                 raise asyncio.CancelledError()
 
             url = item["url"]
-            series = item.get("series", "0")
-            release = item.get("release", "0")
             filename = Path(url).name
+            dest_path = dest_for(item)
 
-            dest_path = (
-                base_dir
-                / f"rel-{release}"
-                / f"series-{series}"
-                / filename
-            )
-
-            logger.info(f"[download_item] starting {filename} on {threading.current_thread().name}")
+            logger.debug("[download_item] starting %s", filename)
 
             if callback:
                 callback(filename, "starting", 0.0)
@@ -367,12 +736,15 @@ async def _download_all(
                         dest_path,
                         session=session,
                         progress_callback=file_progress,
+                        h2_client=h2_client,
+                        cache=cache,
+                        multipart_slots=large_sem,
                     )
-                    logger.info(f"[download_item] finished {filename} success={success}")
+                    logger.debug("[download_item] finished %s success=%s", filename, success)
             except asyncio.CancelledError:
                 raise
             except Exception as exc:
-                logger.error(f"Unexpected error downloading {url}: {exc}")
+                logger.error("Unexpected error downloading %s: %s", url, exc)
                 success = False
 
             async with lock:
@@ -386,16 +758,37 @@ async def _download_all(
                     if callback:
                         callback(filename, "error", 0.0)
 
-                overall_pct = (processed / total_items) * 100 if total_items else 100.0
-                if callback:
-                    callback("__overall__", "overall_progress", overall_pct)
+                if callback and total_items:
+                    callback("__overall__", "overall_progress", (processed / total_items) * 100)
 
                 if pbar is not None:
                     pbar.update(1)
 
-        with tqdm_asyncio(total=total_items, desc="Downloading") as pbar:
-            tasks = [asyncio.create_task(download_item(item)) for item in items]
+        # One bar for the whole batch; tqdm's disable=None skips it when stderr is not a TTY
+        # (server/Docker logs), and mininterval bounds redraws however fast files finish.
+        with tqdm_asyncio(
+            total=total_items,
+            desc="Downloading",
+            unit="file",
+            disable=None if show_progress else True,
+            mininterval=float(os.getenv('DOWNLOAD_PROGRESS_MIN_INTERVAL', '0.5')),
+        ) as pbar:
+            for item in cached:
+                processed += 1
+                completed += 1
+                if callback:
+                    callback(Path(item["url"]).name, "file_complete", 100.0)
+            if cached:
+                pbar.update(len(cached))
+                if callback:
+                    callback("__overall__", "overall_progress", (processed / total_items) * 100)
+            tasks = []
             try:
+                if streaming:
+                    async for item in pending:
+                        tasks.append(asyncio.create_task(download_item(item)))
+                else:
+                    tasks = [asyncio.create_task(download_item(item)) for item in pending]
                 await asyncio.gather(*tasks)
             except asyncio.CancelledError:
                 for task in tasks:
@@ -407,7 +800,11 @@ async def _download_all(
             if errors:
                 callback("__overall__", "errors", errors)
     finally:
-        await session.close()
+        cache.save()
+        if close_session:
+            await session.close()
+        if h2_client is not None:
+            await h2_client.aclose()
 
     return errors == 0
 
@@ -415,7 +812,7 @@ async def _download_all(
 #  download_from_json()
 # ------------------------------------------------------------------
 async def download_from_json(
-    src_file: str | Path,
+    src_file: str | Path | list[dict],
     dest_dir: str | Path = "./downloads/",
     url_key: str = "url",
     series_key: str = "series",
@@ -424,14 +821,15 @@ async def download_from_json(
     verbose: bool = True,
     progress_callback: Callable[[str, str, Any], None] | None = None,
     cancel_event: Optional[threading.Event] = None,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> bool:
     """
     High‑level helper that glues all the pieces together.
 
     Parameters
     ----------
-    src_file : path to a JSON file (local or remote)
-        The JSON must contain an array of objects, each having at least the keys defined by *url_key*, *series_key* and *release_key*.
+    src_file : path to a JSON array or JSON Lines (``.jsonl``) manifest, or the already-loaded list
+        The manifest must contain objects, each having at least the keys defined by *url_key*, *series_key* and *release_key*.
     dest_dir : directory where every download will be written (root of the tree)
     url_key      : key that holds the URL in each object
     series_key   : key that holds the series number in each object
@@ -451,20 +849,20 @@ async def download_from_json(
             - "cancelled": downloads aborted before completion
     cancel_event : threading.Event | None
         If provided, download operations abort as soon as the event is set.
+    session : aiohttp.ClientSession | None
+        Reuse this session (see :func:`get_download_session`) instead of opening a new one.
 
     Returns
     -------
     bool
         True when all downloads succeed, False if any files fail.
     """
-    # 1️⃣  Load the JSON file
-    src_path = Path(src_file)
-    with src_path.open() as f:
-        data: list[dict] = json.load(f)
+    # 1️⃣  Load the manifest (JSON array, or JSON Lines parsed line by line)
+    data: list[dict] = src_file if isinstance(src_file, list) else read_records(Path(src_file))
 
     # 2️⃣  Kick off the async download loop
     if verbose:
-        logger.info(f"[json_downloader] → downloading {len(data)} URLs to {dest_dir}")
+        logger.info("[json_downloader] → downloading %d URLs to %s", len(data), dest_dir)
 
     download_task = asyncio.create_task(
         _download_all(
@@ -473,6 +871,8 @@ async def download_from_json(
             concurrency=concurrency,
             callback=progress_callback,
             cancel_event=cancel_event,
+            show_progress=verbose,
+            session=session,
         )
     )
 
@@ -506,6 +906,32 @@ async def download_from_json(
             with contextlib.suppress(asyncio.CancelledError):
                 await cancel_listener
 
+async def download_items(
+    items: AsyncIterator[dict],
+    dest_dir: str | Path = "./downloads/",
+    concurrency: int = 10,
+    verbose: bool = True,
+    progress_callback: Callable[[str, str, Any], None] | None = None,
+) -> bool:
+    """
+    Download manifest objects as they are produced by *items* (e.g. straight from the scraper).
+
+    Takes the same objects, layout and progress events as :func:`download_from_json`, except
+    that ``overall_progress`` is not reported because the total is unknown until the end.
+
+    Returns
+    -------
+    bool
+        True when all downloads succeed, False if any files fail.
+    """
+    return await _download_all(
+        items=items,
+        base_dir=Path(dest_dir),
+        concurrency=concurrency,
+        callback=progress_callback,
+        show_progress=verbose,
+    )
+
 # ------------------------------------------------------------------
 #  Demo / entry point
 # ------------------------------------------------------------------
@@ -0,0 +1,112 @@
+"""Read/write helpers for the JSON manifests exchanged between pipeline stages.
+
+The scraper streams ``links.jsonl`` (JSON Lines: one object per line, appended
+as items are discovered) while the filtered and selected manifests stay plain
+JSON arrays. Readers here accept either layout, chosen by file suffix, so the
+CLI and API layers do not need to care which stage produced a file. orjson is
+used for encoding/decoding when installed, with the stdlib as a fallback.
+Very large JSON arrays are stream-parsed with ijson, when installed, so peak
+memory holds the records rather than the raw text as well; mid-sized ones are
+memory-mapped and handed to orjson without first copying them into a bytes
+object.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+try:  # optional fast JSON codec
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+try:  # optional streaming parser for very large JSON arrays
+    import ijson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    ijson = None  # type: ignore
+
+JSON_LINES_SUFFIX = '.jsonl'
+# JSON arrays at least this large are stream-parsed when ijson is available
+STREAM_MIN_BYTES = int(os.getenv('MANIFEST_STREAM_MIN_MB', '32')) * 1024 * 1024
+# Below this size a plain read() is cheaper than setting up a mapping
+MMAP_MIN_BYTES = 1024 * 1024
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON text or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: int | None = None) -> bytes:
+    """Encode *obj* as UTF-8 JSON bytes (2-space indent when *indent* is set)."""
+    if orjson is not None and indent in (None, 2):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=indent, ensure_ascii=False).encode('utf-8')
+
+
+def is_json_lines(path: str | Path) -> bool:
+    """Return True when *path* is a JSON Lines manifest."""
+    return Path(path).suffix == JSON_LINES_SUFFIX
+
+
+def iter_records(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Yield manifest records from *path*.
+
+    JSON Lines files are parsed one line at a time, so consumers can start
+    working before the whole file has been read. JSON arrays are parsed in
+    one go (from a memory map when orjson is available and the file reaches
+    ``MMAP_MIN_BYTES``), or streamed with ijson once they reach
+    ``STREAM_MIN_BYTES``. Blank lines and empty files yield nothing.
+    """
+    path = Path(path)
+    if is_json_lines(path):
+        with path.open('rb') as handle:
+            for line in handle:
+                if line.strip():
+                    yield loads(line)
+        return
+
+    with path.open('rb') as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if ijson is not None and size >= STREAM_MIN_BYTES:
+            yield from ijson.items(handle, 'item', use_float=True)
+            return
+        if orjson is not None and size >= MMAP_MIN_BYTES:
+            # orjson parses straight out of the page cache through the buffer protocol
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                records = orjson.loads(view)
+        else:
+            raw = handle.read()
+            records = loads(raw) if raw.strip() else []
+    yield from records
+
+
+def read_records(path: str | Path) -> List[Dict[str, Any]]:
+    """Return every record in *path* as a list."""
+    return list(iter_records(path))
+
+
+def count_records(path: str | Path) -> int:
+    """Count records in *path* without keeping them in memory."""
+    return sum(1 for _ in iter_records(path))
+
+
+def write_records(path: str | Path, records: Iterable[Dict[str, Any]], indent: int | None = 2) -> None:
+    """Write *records* to *path* in the layout implied by its suffix."""
+    path = Path(path)
+    if is_json_lines(path):
+        with path.open('wb') as handle:
+            for record in records:
+                handle.write(dumps(record))
+                handle.write(b'\n')
+        return
+
+    path.write_bytes(dumps(list(records), indent=indent))
+
+
+__all__ = ["JSON_LINES_SUFFIX", "loads", "dumps", "is_json_lines", "iter_records", "read_records", "count_records", "write_records"]
@@ -0,0 +1,134 @@
+# Scrapy item pipelines: filter and download PDFs inside the crawl instead of in later passes
+import asyncio
+import logging
+import os
+
+from scrapy.utils.defer import deferred_from_coro
+
+from tools.filtering import LatestVersions
+from tools.json_downloader import download_from_json, download_items
+from tools.manifest import write_records
+
+logger = logging.getLogger(os.getenv('ETSI_SPIDER_LOGGER_NAME', 'etsi_spider'))
+
+
+class PdfDownloadPipeline:
+    """Feeds scraped items into the async downloader while the crawl is still running.
+
+    Items are passed on unchanged, so the feed exporter still writes links.jsonl for
+    later --resume runs. Requires Scrapy's asyncio reactor; the downloads share its loop.
+    The overall result is stored in the ``pdf_download_success`` crawler stat.
+    """
+
+    def __init__(self, stats, dest_dir, concurrency, callback=None):
+        self.stats = stats
+        self.dest_dir = dest_dir
+        self.concurrency = concurrency
+        self.callback = callback
+        self._queue = None
+        self._task = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            crawler.stats,
+            dest_dir=settings.get('PDF_DOWNLOAD_DIR', 'downloads/By-Release'),
+            concurrency=settings.getint('PDF_DOWNLOAD_CONCURRENCY', 5),
+            callback=settings.get('PDF_DOWNLOAD_CALLBACK'),
+        )
+
+    async def _queued_items(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            yield item
+
+    def process_item(self, item, spider):
+        if self._task is None:
+            logger.info("Streaming scraped PDFs into %s while crawling", self.dest_dir)
+            self._queue = asyncio.Queue()
+            self._task = asyncio.ensure_future(
+                download_items(
+                    self._queued_items(),
+                    dest_dir=self.dest_dir,
+                    concurrency=self.concurrency,
+                    progress_callback=self.callback,
+                )
+            )
+        self._queue.put_nowait(dict(item))
+        return item
+
+    async def _finish(self):
+        self._queue.put_nowait(None)
+        success = await self._task
+        self.stats.set_value('pdf_download_success', bool(success))
+        logger.info("Streamed downloads finished (success=%s)", success)
+
+    def close_spider(self, spider):
+        if self._task is None:
+            return None
+        return deferred_from_coro(self._finish())
+
+
+class LatestVersionPipeline:
+    """Reduces scraped items to the latest version per TS and release as they arrive.
+
+    This replaces re-reading links.jsonl after the crawl: when the spider closes, the
+    filtered records are written to ``LATEST_VERSIONS_OUTPUT`` (kept for --resume) and,
+    if ``PDF_DOWNLOAD_DIR`` is set, downloaded on the reactor's asyncio loop before the
+    crawl finishes. Items are passed on unchanged, so links.jsonl is still exported.
+    Results land in the ``latest_version_count``, ``latest_version_skipped`` and
+    ``pdf_download_success`` crawler stats.
+    """
+
+    def __init__(self, stats, output_file, dest_dir=None, concurrency=5, callback=None):
+        self.stats = stats
+        self.output_file = output_file
+        self.dest_dir = dest_dir
+        self.concurrency = concurrency
+        self.callback = callback
+        self.latest = LatestVersions()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        return cls(
+            crawler.stats,
+            output_file=settings.get('LATEST_VERSIONS_OUTPUT', 'downloads/latest.json'),
+            dest_dir=settings.get('PDF_DOWNLOAD_DIR'),
+            concurrency=settings.getint('PDF_DOWNLOAD_CONCURRENCY', 5),
+            callback=settings.get('PDF_DOWNLOAD_CALLBACK'),
+        )
+
+    def process_item(self, item, spider):
+        self.latest.add(dict(item))
+        return item
+
+    async def _download(self, records):
+        logger.info("Downloading %d latest-version PDFs into %s", len(records), self.dest_dir)
+        success = await download_from_json(
+            records,
+            dest_dir=self.dest_dir,
+            concurrency=self.concurrency,
+            progress_callback=self.callback,
+        )
+        self.stats.set_value('pdf_download_success', bool(success))
+        logger.info("Latest-version downloads finished (success=%s)", success)
+
+    def close_spider(self, spider):
+        records = self.latest.records()
+        self.stats.set_value('latest_version_count', len(records))
+        self.stats.set_value('latest_version_skipped', self.latest.skipped)
+        if not records:
+            return None
+        write_records(self.output_file, records, indent=None)
+        logger.info("Wrote %d latest versions to %s", len(records), self.output_file)
+        if not self.dest_dir:
+            return None
+        return deferred_from_coro(self._download(records))
+
+
+PIPELINE_PATH = "tools.pipelines.PdfDownloadPipeline"
+LATEST_PIPELINE_PATH = "tools.pipelines.LatestVersionPipeline"
@@ -0,0 +1,118 @@
+"""Per-host adaptive throttling for HTTP 429 responses.
+
+Fixed exponential backoff makes every in-flight request retry on its own
+schedule, so a throttled host sees the same burst again a moment later. The
+throttle here is shared by all requests to a host: a 429 pushes the host's
+next allowed start time out (honouring ``Retry-After``) and spaces subsequent
+requests by the current delay, which is halved again after a run of
+successful responses. The async downloader uses it for every probe and range request.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+
+@dataclass
+class _HostState:
+    delay: float = 0.0
+    next_allowed: float = 0.0
+    ok_streak: int = 0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds carried by a ``Retry-After`` header, if any."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class HostThrottle:
+    """Shared 429 throttle keyed by host.
+
+    Args:
+        base_delay (float): Delay applied on a 429 without ``Retry-After`` when the host is not yet throttled.
+        max_delay (float): Upper bound for the per-host delay.
+        recovery_streak (int): Consecutive successes required before the delay is halved.
+    """
+
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 60.0, recovery_streak: int = 3) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.recovery_streak = recovery_streak
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).netloc
+
+    def reserve(self, url: str) -> float:
+        """Claim the next request slot for *url*'s host and return how long to wait for it."""
+        now = time.monotonic()
+        with self._lock:
+            state = self._hosts.get(self._host(url))
+            if state is None or (state.delay == 0.0 and state.next_allowed <= now):
+                return 0.0
+            start = max(now, state.next_allowed)
+            state.next_allowed = start + state.delay
+            return start - now
+
+    def record(self, url: str, status: int, retry_after: Optional[str] = None) -> None:
+        """Feed a response status back into the host's throttle state."""
+        host = self._host(url)
+        with self._lock:
+            state = self._hosts.get(host)
+            if status == 429:
+                if state is None:
+                    state = self._hosts[host] = _HostState()
+                delay = parse_retry_after(retry_after)
+                if delay is None:
+                    delay = max(state.delay * 2, self.base_delay)
+                state.delay = min(delay, self.max_delay)
+                state.next_allowed = max(state.next_allowed, time.monotonic() + state.delay)
+                state.ok_streak = 0
+                return
+
+            if state is None or status >= 400:
+                return
+            state.ok_streak += 1
+            if state.ok_streak >= self.recovery_streak:
+                state.ok_streak = 0
+                state.delay /= 2
+                if state.delay < self.base_delay / 16:
+                    del self._hosts[host]
+
+
+_SHARED: Optional[HostThrottle] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_throttle() -> HostThrottle:
+    """Return the process-wide throttle configured from ``THROTTLE_*`` settings."""
+    global _SHARED
+    if _SHARED is None:
+        with _SHARED_LOCK:
+            if _SHARED is None:
+                _SHARED = HostThrottle(
+                    base_delay=float(os.getenv('THROTTLE_BASE_DELAY', os.getenv('RETRY_BASE_DELAY', '1.0'))),
+                    max_delay=float(os.getenv('THROTTLE_MAX_DELAY', os.getenv('RETRY_MAX_DELAY', '60.0'))),
+                    recovery_streak=int(os.getenv('THROTTLE_RECOVERY_STREAK', '3')),
+                )
+    return _SHARED
+
+
+__all__ = ["HostThrottle", "get_throttle", "parse_retry_after"]
@@ -1,7 +1,8 @@
 # logging_config.py
 import logging
+import os
 from logging.handlers import RotatingFileHandler
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 # Define the format string with placeholders
 # - asctime: For date/time
@@ -16,6 +17,10 @@ default_fmt = '%(asctime)s.%(msecs)03d-%(filename)s:%(lineno)d-%(funcName)s()-%(
 # Example: 25-12-2023 14:30:59.123
 date_fmt='%d-%m-%Y %H:%M:%S'
 
+# One rotating handler per (log file, level): every module logs to the same file, and
+# separate handlers would each hold a descriptor and race each other on rotation.
+_FILE_HANDLERS: Dict[Tuple[str, int], RotatingFileHandler] = {}
+
 def setup_logger(name: str = 'default_app_logger', log_file: Optional[str] = '', console_level: int = logging.INFO, logfile_level: int = logging.DEBUG, max_bytes: int = 10485760, backup_count: int = 5) -> logging.Logger:
     """
     Sets up a logger with a file handler and a console handler.
@@ -48,9 +53,13 @@ def setup_logger(name: str = 'default_app_logger', log_file: Optional[str] = '',
         if log_file:
             #print (f'Adding file handler for log file: {log_file}')
             # File handler for logging to a file with rotation
-            file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
-            file_handler.setLevel(logfile_level)
-            file_handler.setFormatter(formatter)
+            key = (os.path.abspath(log_file), logfile_level)
+            file_handler = _FILE_HANDLERS.get(key)
+            if file_handler is None:
+                file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count)
+                file_handler.setLevel(logfile_level)
+                file_handler.setFormatter(formatter)
+                _FILE_HANDLERS[key] = file_handler
             logger.addHandler(file_handler)
 
     return logger
@@ -6,10 +6,9 @@ A web interface for the 3GPP specification downloader using Mesop framework.
 import mesop as me
 import mesop.labs as mel
 from pathlib import Path
-import json
 import asyncio
 import threading
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set
 import time
 import os
 import logging
@@ -25,6 +24,7 @@ backup_count = int(os.getenv('WEB_APP_BACKUP_COUNT', '5'))
 
 web_logger = setup_logger(logger_name, log_file=logging_file, console_level=console_level, logfile_level=file_level, max_bytes=max_bytes, backup_count=backup_count)
 from main import scrape_data, filter_latest_versions, download_data, scrape_data_with_config, download_data_with_config
+from tools.manifest import dumps, loads, read_records
 
 # Design System Constants
 class Theme:
@@ -211,7 +211,7 @@ class AppState:
         self.current_operation = ""
         self.log_messages: List[str] = []
         self.available_files: List[Dict] = []
-        self.selected_files: List[str] = []
+        self.selected_files: Set[str] = set()  # URLs; membership is checked per rendered row
         self.current_file_type = "none"  # "none", "filtered", "all"
         self.current_page = 0
         self.show_download_confirmation = False
@@ -349,8 +349,7 @@ def save_settings():
             "release_filter": app_state.release_filter
         }
         
-        with open(settings_file, 'w') as f:
-            json.dump(settings_data, f, indent=2)
+        settings_file.write_bytes(dumps(settings_data, indent=2))
         
         add_log_message(f"Settings saved to {settings_file}")
     except Exception as e:
@@ -361,8 +360,7 @@ def load_settings():
     settings_file = Path("web_settings.json")
     try:
         if settings_file.exists():
-            with open(settings_file, 'r') as f:
-                settings_data = json.load(f)
+            settings_data = loads(settings_file.read_bytes())
             
             # Load download options
             app_state.resume_downloads = settings_data.get("resume_downloads", True)
@@ -1271,8 +1269,8 @@ def dashboard_content():
             files_status = []
             if Path('downloads/latest.json').exists():
                 files_status.append("✅ Filtered versions available (latest.json)")
-            if Path('downloads/links.json').exists():
-                files_status.append("✅ All versions available (links.json)")
+            if Path('downloads/links.jsonl').exists() or Path('downloads/links.json').exists():
+                files_status.append("✅ All versions available (links.jsonl)")
             
             if files_status:
                 me.text("Files ready for download:", style=me.Style(
@@ -2306,7 +2304,7 @@ def filter_versions(e: me.ClickEvent):
     add_log_message("Filtering to latest versions...")
 
     source_path = None
-    for candidate in [Path('downloads/links.json'), Path('links.json')]:
+    for candidate in [Path('downloads/links.jsonl'), Path('downloads/links.json'), Path('links.json')]:
         if candidate.exists():
             source_path = candidate
             break
@@ -2318,7 +2316,7 @@ def filter_versions(e: me.ClickEvent):
             "Filtering Unavailable",
             message,
             [
-                "Run Start Scraping to generate downloads/links.json",
+                "Run Start Scraping to generate downloads/links.jsonl",
                 "Copy an existing links.json into the downloads folder",
                 "Turn on 'Download all versions' if you prefer to skip filtering"
             ]
@@ -2344,7 +2342,7 @@ def filter_versions(e: me.ClickEvent):
                     "Filtering Failed",
                     "No valid specifications were produced. Check logs for details.",
                     [
-                        "Confirm downloads/links.json contains valid specification entries",
+                        "Confirm downloads/links.jsonl contains valid specification entries",
                         "Try scraping again to regenerate the source data"
                     ]
                 )
@@ -2418,15 +2416,11 @@ def confirm_download(e: me.ClickEvent):
         try:
             update_download_progress(10, "Initializing downloader...")
 
-            # Create filtered JSON for selected files
-            filtered_data = selected_urls
-            with open('selected.json', 'w') as f:
-                json.dump(filtered_data, f, indent=2)
-
             update_download_progress(12, f"Queued {len(selected_urls)} files for download")
             
+            # The selection is handed over directly instead of round-tripping through selected.json
             success = download_data_with_config(
-                input_file='selected.json',
+                input_file=selected_urls,
                 resume=app_state.resume_downloads,
                 no_download=app_state.no_download,
                 all_versions=app_state.download_all_versions,
@@ -2558,18 +2552,16 @@ def load_available_files():
         
         for latest_path in latest_paths:
             if latest_path.exists():
-                with open(latest_path, 'r') as f:
-                    app_state.available_files = json.load(f)
+                app_state.available_files = read_records(latest_path)
                 add_log_message(f"Loaded {len(app_state.available_files)} available files from {latest_path}")
                 app_state.current_file_type = "filtered"
                 return
         
         # If no latest.json found, try links.json as fallback
-        links_paths = [Path('links.json'), Path('downloads/links.json')]
+        links_paths = [Path('links.json'), Path('downloads/links.jsonl'), Path('downloads/links.json')]
         for links_path in links_paths:
             if links_path.exists():
-                with open(links_path, 'r') as f:
-                    app_state.available_files = json.load(f)
+                app_state.available_files = read_records(links_path)
                 add_log_message(f"Loaded {len(app_state.available_files)} available files from {links_path} (fallback)")
                 app_state.current_file_type = "all"
                 return
@@ -2586,24 +2578,19 @@ def on_file_selection_change(e: me.CheckboxChangeEvent):
     """Handle file selection changes"""
     url = e.key.replace("file_", "")
     if e.checked:
-        if url not in app_state.selected_files:
-            app_state.selected_files.append(url)
+        app_state.selected_files.add(url)
     else:
-        if url in app_state.selected_files:
-            app_state.selected_files.remove(url)
+        app_state.selected_files.discard(url)
 
 def select_all_files(e: me.ClickEvent):
     """Select all filtered files"""
     filtered_files = get_filtered_files()
-    for file_info in filtered_files:
-        url = file_info.get('url', '')
-        if url and url not in app_state.selected_files:
-            app_state.selected_files.append(url)
+    app_state.selected_files.update(url for url in (f.get('url') for f in filtered_files) if url)
     add_log_message(f"Selected all {len([f for f in filtered_files if f.get('url') in app_state.selected_files])} filtered files")
 
 def deselect_all_files(e: me.ClickEvent):
     """Deselect all files"""
-    app_state.selected_files = []
+    app_state.selected_files.clear()
     add_log_message("Deselected all files")
 
 def on_search_change(e: me.InputBlurEvent):
@@ -1,9 +1,9 @@
-import json
 from pathlib import Path
 
 import pytest
 
-from src.tools.filtering import filter_latest_records
+from src.tools.filtering import LatestVersions, filter_latest_records
+from src.tools.manifest import read_records
 
 
 def test_filter_latest_records_keeps_all_latest_versions(tmp_path):
@@ -53,11 +53,12 @@ def test_filter_latest_records_keeps_all_latest_versions(tmp_path):
 
 
 def test_filter_latest_records_matches_real_links_fixture():
-    sample_path = Path("downloads/links.json")
-    if not sample_path.exists():
-        pytest.skip("downloads/links.json fixture not present")
+    candidates = [Path("downloads/links.jsonl"), Path("downloads/links.json")]
+    sample_path = next((path for path in candidates if path.exists()), None)
+    if sample_path is None:
+        pytest.skip("downloads/links.jsonl fixture not present")
 
-    data = json.loads(sample_path.read_text())
+    data = read_records(sample_path)
     filtered, skipped = filter_latest_records(data)
 
     assert isinstance(filtered, list)
@@ -91,3 +92,16 @@ def test_filter_latest_records_groups_by_release():
     assert "old-rel17" not in urls
     assert "old-rel16" not in urls
     assert "old-none" not in urls
+
+
+def test_latest_versions_reduces_incrementally():
+    latest = LatestVersions()
+    latest.add({"ts_number": "38.331", "version": "18.1.0", "url": "old"})
+    assert [item["url"] for item in latest.records()] == ["old"]
+
+    latest.add({"ts_number": "38.331", "version": "18.2.0", "url": "new"})
+    latest.add({"ts_number": "38.331", "version": "18.0.0", "url": "older"})
+    latest.add({"version": "18.2.0", "url": "no-ts"})
+
+    assert [item["url"] for item in latest.records()] == ["new"]
+    assert latest.skipped == 1
@@ -0,0 +1,43 @@
+from src.tools.manifest import count_records, iter_records, read_records, write_records
+
+
+RECORDS = [
+    {"ts_number": "23.501", "version": "18.10.00", "url": "https://example.com/a.pdf"},
+    {"ts_number": "36.101", "version": "18.1.0", "url": "https://example.com/b.pdf"},
+]
+
+
+def test_json_lines_round_trip(tmp_path):
+    path = tmp_path / "links.jsonl"
+    write_records(path, RECORDS)
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == 2
+    assert read_records(path) == RECORDS
+    assert count_records(path) == 2
+
+
+def test_json_array_round_trip(tmp_path):
+    path = tmp_path / "latest.json"
+    write_records(path, iter(RECORDS))
+
+    assert path.read_text().lstrip().startswith("[")
+    assert read_records(path) == RECORDS
+
+
+def test_blank_lines_and_empty_files_yield_nothing(tmp_path):
+    lines_path = tmp_path / "links.jsonl"
+    lines_path.write_text('\n{"url": "x"}\n\n')
+    empty_path = tmp_path / "latest.json"
+    empty_path.write_text("")
+
+    assert list(iter_records(lines_path)) == [{"url": "x"}]
+    assert read_records(empty_path) == []
+
+
+def test_large_json_array_is_read_through_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.tools.manifest.MMAP_MIN_BYTES", 1)
+    path = tmp_path / "latest.json"
+    write_records(path, RECORDS, indent=None)
+
+    assert read_records(path) == RECORDS
@@ -0,0 +1,32 @@
+import logging
+import logging.handlers
+import queue
+
+from src.api import scrape_worker
+
+
+def test_progress_updates_are_relayed_in_order(monkeypatch):
+    progress_queue = queue.Queue()
+    monkeypatch.setattr(scrape_worker, "_progress_queue", progress_queue)
+
+    scrape_worker._queue_progress(12.5, {"items": 0, "requests": 10, "responses": 0}, None)
+    scrape_worker._queue_progress(40.0, {"items": 3, "requests": 10, "responses": 8}, "Processed 500 responses")
+    progress_queue.put(None)
+
+    applied = []
+    scrape_worker.drain_progress(progress_queue, lambda progress, message: applied.append((progress, message)))
+
+    assert applied == [(12.5, None), (40.0, "Processed 500 responses")]
+
+
+def test_worker_loggers_only_forward_to_the_queue(tmp_path):
+    from src.utils.logging_config import setup_logger
+
+    log_queue = queue.Queue()
+    scrape_worker._init_worker(log_queue, ["scrape_worker_test"], logging.INFO)
+    logger = setup_logger("scrape_worker_test", log_file=str(tmp_path / "parent.log"))
+    logger.info("from the child")
+
+    assert [type(handler) for handler in logger.handlers] == [logging.handlers.QueueHandler]
+    assert log_queue.get_nowait().getMessage() == "from the child"
+    assert not (tmp_path / "parent.log").exists()
@@ -0,0 +1,40 @@
+from src.tools.throttle import HostThrottle, parse_retry_after
+
+
+URL = "https://www.etsi.org/deliver/etsi_ts/123500_123599/123501/"
+
+
+def test_unthrottled_host_never_waits():
+    throttle = HostThrottle()
+    throttle.record(URL, 200)
+    assert throttle.reserve(URL) == 0.0
+
+
+def test_429_honours_retry_after_and_spaces_requests():
+    throttle = HostThrottle(base_delay=1.0, max_delay=60.0)
+    throttle.record(URL, 429, "5")
+
+    first = throttle.reserve(URL)
+    second = throttle.reserve(URL)
+    assert 4.5 < first <= 5.0
+    assert second - first > 4.5
+
+
+def test_delay_doubles_then_recovers_after_successes():
+    throttle = HostThrottle(base_delay=1.0, max_delay=3.0, recovery_streak=3)
+    throttle.record(URL, 429)
+    throttle.record(URL, 429)
+    throttle.record(URL, 429)
+    state = throttle._hosts["www.etsi.org"]
+    assert state.delay == 3.0
+
+    for _ in range(3):
+        throttle.record(URL, 206)
+    assert state.delay == 1.5
+
+
+def test_parse_retry_after_formats():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0